@@ -1,4 +1,7 @@
+from array import array
+from collections.abc import Mapping
 from enum import Enum, Flag, auto
+from functools import lru_cache
 from typing import TYPE_CHECKING, NamedTuple, Optional
 
 from BaseClasses import Location, Region
@@ -1270,3 +1273,118 @@ def split_location_name_by_zone(location_name: str) -> tuple[str, str]:
         zone_name = specific_location_name = location_name
 
     return zone_name, specific_location_name
+
+
+class LocationColumns:
+    """
+    This class stores the fields of the location table that generation scans (flags, region, and zone) in columns, with
+    one compact array per field.
+
+    The flags are stored as integer bitmasks, and the region and zone of each location are stored as indices into
+    tuples of interned names. Scans over the columns avoid operating on `TWWFlag` values and splitting location names,
+    which is much faster than scanning the location table. The location table remains the mapping used for lookups by
+    name.
+
+    :param table: The location table.
+    """
+
+    def __init__(self, table: Mapping[str, TWWLocationData]):
+        self.names: tuple[str, ...] = tuple(table)
+        self.index: dict[str, int] = {name: index for index, name in enumerate(self.names)}
+
+        self.region_names: tuple[str, ...] = tuple(dict.fromkeys(data.region for data in table.values()))
+        region_indices = {name: index for index, name in enumerate(self.region_names)}
+        zones = [split_location_name_by_zone(name)[0] for name in self.names]
+        self.zone_names: tuple[str, ...] = tuple(dict.fromkeys(zones))
+        zone_indices = {name: index for index, name in enumerate(self.zone_names)}
+
+        self.flags = array("L", (data.flags.value for data in table.values()))
+        self.regions = array("H", (region_indices[data.region] for data in table.values()))
+        self.zones = array("H", (zone_indices[zone] for zone in zones))
+
+    def zone_of(self, location_name: str) -> str:
+        """
+        Retrieve the zone name of a location.
+
+        :param location_name: The name of the location.
+        :return: The name of the location's zone.
+        """
+        return self.zone_names[self.zones[self.index[location_name]]]
+
+    def flags_of(self, location_name: str) -> int:
+        """
+        Retrieve the flags of a location as an integer bitmask.
+
+        :param location_name: The name of the location.
+        :return: The location's flags.
+        """
+        return self.flags[self.index[location_name]]
+
+    def with_any_flag(self, flags: int) -> list[str]:
+        """
+        Retrieve the locations with at least one of the given flags, in table order.
+
+        :param flags: The integer bitmask of `TWWFlag` values.
+        :return: The names of the matching locations.
+        """
+        return [name for name, location_flags in zip(self.names, self.flags) if location_flags & flags]
+
+    def group_by_zone(self) -> dict[str, tuple[str, ...]]:
+        """
+        Group the locations by their zone.
+
+        :return: The names of the locations in each zone, in table order, keyed by zone name.
+        """
+        groups: dict[str, list[str]] = {name: [] for name in self.zone_names}
+        for name, zone in zip(self.names, self.zones):
+            groups[self.zone_names[zone]].append(name)
+        return {zone_name: tuple(names) for zone_name, names in groups.items()}
+
+    def group_by_region(self) -> dict[str, tuple[str, ...]]:
+        """
+        Group the locations by their region.
+
+        :return: The names of the locations in each region, in table order, keyed by region name.
+        """
+        groups: dict[str, list[str]] = {name: [] for name in self.region_names}
+        for name, region in zip(self.names, self.regions):
+            groups[self.region_names[region]].append(name)
+        return {region_name: tuple(names) for region_name, names in groups.items()}
+
+    def group_by_flag(self) -> dict[TWWFlag, tuple[str, ...]]:
+        """
+        Group the locations by each of their flags.
+
+        :return: The names of the locations with each flag, in table order, keyed by flag.
+        """
+        return {flag: tuple(self.with_any_flag(flag.value)) for flag in TWWFlag}
+
+
+LOCATION_COLUMNS = LocationColumns(LOCATION_TABLE)
+
+# Indexes of the location names by zone, region, and flag. Each index lists the location names in table order.
+LOCATION_NAMES_BY_ZONE: dict[str, tuple[str, ...]] = LOCATION_COLUMNS.group_by_zone()
+LOCATION_NAMES_BY_REGION: dict[str, tuple[str, ...]] = LOCATION_COLUMNS.group_by_region()
+LOCATION_NAMES_BY_FLAG: dict[TWWFlag, tuple[str, ...]] = LOCATION_COLUMNS.group_by_flag()
+
+
+@lru_cache(maxsize=None)
+def get_progress_and_nonprogress_locations(enabled_flags: int) -> tuple[frozenset[str], frozenset[str]]:
+    """
+    Split the locations into progress and nonprogress locations based on the enabled flags.
+
+    A location is progress if all of its flags are enabled. The result is cached, so worlds with the same progression
+    options share it.
+
+    :param enabled_flags: The integer bitmask of the enabled `TWWFlag` values.
+    :return: A tuple of two sets, the first containing the names of the progress locations and the second containing
+    the names of the nonprogress locations.
+    """
+    progress_locations: list[str] = []
+    nonprogress_locations: list[str] = []
+    for location_name, flags in zip(LOCATION_COLUMNS.names, LOCATION_COLUMNS.flags):
+        if flags & enabled_flags == flags:
+            progress_locations.append(location_name)
+        else:
+            nonprogress_locations.append(location_name)
+    return frozenset(progress_locations), frozenset(nonprogress_locations)
@@ -0,0 +1,786 @@
+import ast
+import pkgutil
+from collections.abc import Callable
+from dataclasses import dataclass
+from operator import methodcaller
+from typing import TYPE_CHECKING, Any, ClassVar, NamedTuple, Optional, Union
+
+from .Items import item_name_groups
+
+if TYPE_CHECKING:
+    from BaseClasses import CollectionState
+
+    from . import TWWWorld
+    from .Options import TWWOptions
+
+# The maximum number of clauses a single disjunctive normal form may have before the compiler gives up on flattening
+# that expression and keeps its structure instead.
+MAX_DNF_CLAUSES = 64
+
+# The maximum number of clause combinations the compiler will try when distributing a conjunction over disjunctions.
+MAX_DNF_PRODUCT = 4096
+
+
+class LogicCompileError(Exception):
+    """
+    Raised when an expression in `Macros.py` or `Rules.py` uses a construct that the logic compiler does not support.
+    """
+
+
+@dataclass(frozen=True)
+class ItemRequirement:
+    """
+    A requirement that the player has at least `count` copies of an item.
+    """
+
+    item_name: str
+    count: int = 1
+
+
+@dataclass(frozen=True)
+class GroupRequirement:
+    """
+    A requirement that the player has at least `count` unique items from an item name group.
+    """
+
+    group_name: str
+    count: int = 1
+
+
+@dataclass(frozen=True)
+class RegionRequirement:
+    """
+    A requirement that the player can reach a region.
+    """
+
+    region_name: str
+
+
+@dataclass(frozen=True)
+class StateRequirement:
+    """
+    A requirement that is evaluated by calling one of the `_tww_*` methods of `TWWLogic` on the collection state.
+    """
+
+    method_name: str
+    args: tuple[int, ...] = ()
+    negated: bool = False
+
+
+Requirement = Union[ItemRequirement, GroupRequirement, RegionRequirement, StateRequirement]
+
+
+class LogicGates(NamedTuple):
+    """
+    This class holds the answers to the option checks made by the logic, resolved once from a world's options.
+
+    :param in_swordless_mode: Whether the sword mode is swords optional or swordless.
+    :param in_required_bosses_mode: Whether required bosses mode is enabled.
+    :param obscure_1: Whether the logic obscurity is at least normal.
+    :param obscure_2: Whether the logic obscurity is at least hard.
+    :param obscure_3: Whether the logic obscurity is very hard.
+    :param precise_1: Whether the logic precision is at least normal.
+    :param precise_2: Whether the logic precision is at least hard.
+    :param precise_3: Whether the logic precision is very hard.
+    :param tuner_logic_enabled: Whether the Tingle Tuner is considered in logic.
+    :param rematch_bosses_skipped: Whether the rematch bosses in Ganon's Tower are skipped.
+    """
+
+    in_swordless_mode: bool
+    in_required_bosses_mode: bool
+    obscure_1: bool
+    obscure_2: bool
+    obscure_3: bool
+    precise_1: bool
+    precise_2: bool
+    precise_3: bool
+    tuner_logic_enabled: bool
+    rematch_bosses_skipped: bool
+
+    @classmethod
+    def from_options(cls, options: "TWWOptions") -> "LogicGates":
+        """
+        Resolve the logic's option checks for a world's options.
+
+        :param options: The world's options.
+        :return: The resolved option checks.
+        """
+        obscurity = options.logic_obscurity
+        precision = options.logic_precision
+        return cls(
+            in_swordless_mode=options.sword_mode in ("swords_optional", "swordless"),
+            in_required_bosses_mode=bool(options.required_bosses),
+            obscure_1=obscurity in ("normal", "hard", "very_hard"),
+            obscure_2=obscurity in ("hard", "very_hard"),
+            obscure_3=obscurity == "very_hard",
+            precise_1=precision in ("normal", "hard", "very_hard"),
+            precise_2=precision in ("hard", "very_hard"),
+            precise_3=precision == "very_hard",
+            tuner_logic_enabled=bool(options.enable_tuner_logic),
+            rematch_bosses_skipped=bool(options.skip_rematch_bosses),
+        )
+
+
+# The `TWWLogic` methods that only depend on options, mapped to the gate they read and whether that gate is negated.
+OPTION_GATE_METHODS: dict[str, tuple[str, bool]] = {
+    "_tww_in_swordless_mode": ("in_swordless_mode", False),
+    "_tww_outside_swordless_mode": ("in_swordless_mode", True),
+    "_tww_in_required_bosses_mode": ("in_required_bosses_mode", False),
+    "_tww_outside_required_bosses_mode": ("in_required_bosses_mode", True),
+    "_tww_obscure_1": ("obscure_1", False),
+    "_tww_obscure_2": ("obscure_2", False),
+    "_tww_obscure_3": ("obscure_3", False),
+    "_tww_precise_1": ("precise_1", False),
+    "_tww_precise_2": ("precise_2", False),
+    "_tww_precise_3": ("precise_3", False),
+    "_tww_tuner_logic_enabled": ("tuner_logic_enabled", False),
+    "_tww_rematch_bosses_skipped": ("rematch_bosses_skipped", False),
+}
+
+
+@dataclass(frozen=True)
+class MacroCall:
+    """
+    A call to another function defined in `Macros.py`.
+    """
+
+    macro_name: str
+
+
+@dataclass(frozen=True)
+class AllOf:
+    """
+    A conjunction of expressions.
+    """
+
+    children: tuple["Expression", ...]
+
+
+@dataclass(frozen=True)
+class AnyOf:
+    """
+    A disjunction of expressions.
+    """
+
+    children: tuple["Expression", ...]
+
+
+Expression = Union[bool, Requirement, MacroCall, AllOf, AnyOf]
+
+# A clause is a conjunction of requirements, and a DNF is a disjunction of clauses.
+Clause = frozenset[Requirement]
+DNF = tuple[Clause, ...]
+
+
+def _parse_expression(node: ast.expr) -> Expression:
+    """
+    Convert the AST of a macro body or rule lambda into a logic expression.
+
+    :param node: The AST node to convert.
+    :raises LogicCompileError: If the node uses an unsupported construct.
+    :return: The logic expression for the node.
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, bool):
+        return node.value
+
+    if isinstance(node, ast.BoolOp):
+        children = tuple(_parse_expression(value) for value in node.values)
+        return AllOf(children) if isinstance(node.op, ast.And) else AnyOf(children)
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        operand = _parse_expression(node.operand)
+        if isinstance(operand, bool):
+            return not operand
+        if isinstance(operand, StateRequirement):
+            return StateRequirement(operand.method_name, operand.args, not operand.negated)
+        raise LogicCompileError(f"Unsupported negation: {ast.unparse(node)}")
+
+    if isinstance(node, ast.Call) and not node.keywords:
+        func = node.func
+        args = node.args
+
+        # A call to another macro, e.g., `has_heros_sword(state, player)`.
+        if isinstance(func, ast.Name) and _is_state_player_args(args):
+            return MacroCall(func.id)
+
+        # A call to a method of the collection state, e.g., `state.has("Bombs", player)`.
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "state":
+            method_name = func.attr
+            if method_name == "has" and 2 <= len(args) <= 3 and _is_player_arg(args[1]):
+                count = _constant(args[2], int) if len(args) == 3 else 1
+                return ItemRequirement(_constant(args[0], str), count)
+            if method_name == "has_group_unique" and 2 <= len(args) <= 3 and _is_player_arg(args[1]):
+                count = _constant(args[2], int) if len(args) == 3 else 1
+                return GroupRequirement(_constant(args[0], str), count)
+            if method_name == "can_reach_region" and len(args) == 2 and _is_player_arg(args[1]):
+                return RegionRequirement(_constant(args[0], str))
+            if method_name.startswith("_tww_") and args and _is_player_arg(args[0]):
+                return StateRequirement(method_name, tuple(_constant(arg, int) for arg in args[1:]))
+
+    raise LogicCompileError(f"Unsupported expression: {ast.unparse(node)}")
+
+
+def _is_player_arg(node: ast.expr) -> bool:
+    return isinstance(node, ast.Name) and node.id == "player"
+
+
+def _is_state_player_args(args: list[ast.expr]) -> bool:
+    return (
+        len(args) == 2 and isinstance(args[0], ast.Name) and args[0].id == "state" and _is_player_arg(args[1])
+    )
+
+
+def _constant(node: ast.expr, expected_type: type) -> Any:
+    if not isinstance(node, ast.Constant) or not isinstance(node.value, expected_type):
+        raise LogicCompileError(f"Expected a constant {expected_type.__name__}: {ast.unparse(node)}")
+    return node.value
+
+
+def _load_source_tree(file_name: str) -> Optional[ast.Module]:
+    """
+    Load and parse the source of one of this package's modules.
+
+    The source is read through the package's loader so that it also works when the package is bundled as an apworld.
+
+    :param file_name: The file name of the module, relative to this package.
+    :return: The parsed module, or `None` if the source is unavailable.
+    """
+    try:
+        source = pkgutil.get_data(__package__, file_name)
+    except OSError:
+        return None
+    if source is None:
+        return None
+    return ast.parse(source.decode("utf-8"), filename=file_name)
+
+
+def _parse_macros() -> dict[str, Expression]:
+    """
+    Parse every macro in `Macros.py` into a logic expression.
+
+    Macros that use unsupported constructs are left out, so rules depending on them are not compiled.
+
+    :return: A dictionary mapping macro names to their logic expressions.
+    """
+    tree = _load_source_tree("Macros.py")
+    if tree is None:
+        return {}
+
+    macros: dict[str, Expression] = {}
+    for node in tree.body:
+        if not isinstance(node, ast.FunctionDef) or len(node.body) != 1 or not isinstance(node.body[0], ast.Return):
+            continue
+        return_value = node.body[0].value
+        if return_value is None:
+            continue
+        try:
+            macros[node.name] = _parse_expression(return_value)
+        except LogicCompileError:
+            continue
+    return macros
+
+
+def _parse_location_rules() -> dict[str, Expression]:
+    """
+    Parse every `set_rule_if_exists` call in `Rules.set_rules` into a logic expression.
+
+    :return: A dictionary mapping location names to the logic expressions of their rules.
+    """
+    tree = _load_source_tree("Rules.py")
+    if tree is None:
+        return {}
+
+    rules: dict[str, Expression] = {}
+    for node in ast.walk(tree):
+        if not (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id == "set_rule_if_exists"
+            and len(node.args) == 2
+            and isinstance(node.args[0], ast.Constant)
+            and isinstance(node.args[1], ast.Lambda)
+        ):
+            continue
+        try:
+            rules[node.args[0].value] = _parse_expression(node.args[1].body)
+        except LogicCompileError:
+            continue
+    return rules
+
+
+MACRO_EXPRESSIONS: dict[str, Expression] = _parse_macros()
+LOCATION_RULE_EXPRESSIONS: dict[str, Expression] = _parse_location_rules()
+
+
+def _merge_clauses(first: Clause, second: Clause) -> Optional[Clause]:
+    """
+    Compute the conjunction of two clauses, keeping only the highest count required for each item or group.
+
+    :param first: The first clause.
+    :param second: The second clause.
+    :return: The merged clause, or `None` if the clauses contradict each other.
+    """
+    merged: dict[object, Requirement] = {}
+    for requirement in (*first, *second):
+        if isinstance(requirement, ItemRequirement):
+            key: object = ("item", requirement.item_name)
+        elif isinstance(requirement, GroupRequirement):
+            key = ("group", requirement.group_name)
+        elif isinstance(requirement, StateRequirement):
+            key = ("state", requirement.method_name, requirement.args)
+            existing = merged.get(key)
+            if existing is not None and existing != requirement:
+                # A state requirement and its negation cannot both hold.
+                return None
+        else:
+            key = requirement
+
+        existing = merged.get(key)
+        if existing is None or getattr(requirement, "count", 0) > getattr(existing, "count", 0):
+            merged[key] = requirement
+    return frozenset(merged.values())
+
+
+def _clause_implies(stronger: Clause, weaker: Clause) -> bool:
+    """
+    Determine whether satisfying one clause guarantees that another is satisfied.
+
+    :param stronger: The clause that may imply the other.
+    :param weaker: The clause that may be implied.
+    :return: `True` if every requirement of `weaker` is covered by a requirement of `stronger`.
+    """
+    for requirement in weaker:
+        if requirement in stronger:
+            continue
+        if isinstance(requirement, ItemRequirement):
+            if any(
+                isinstance(other, ItemRequirement)
+                and other.item_name == requirement.item_name
+                and other.count >= requirement.count
+                for other in stronger
+            ):
+                continue
+        elif isinstance(requirement, GroupRequirement):
+            if any(
+                isinstance(other, GroupRequirement)
+                and other.group_name == requirement.group_name
+                and other.count >= requirement.count
+                for other in stronger
+            ):
+                continue
+        return False
+    return True
+
+
+def _minimize(clauses: list[Clause]) -> DNF:
+    """
+    Remove duplicate clauses and clauses absorbed by a weaker clause.
+
+    :param clauses: The clauses of a DNF.
+    :return: The minimized DNF, with clauses ordered from fewest to most requirements.
+    """
+    unique_clauses = sorted(set(clauses), key=lambda clause: (len(clause), sorted(map(repr, clause))))
+    kept: list[Clause] = []
+    for clause in unique_clauses:
+        if not any(_clause_implies(clause, weaker) for weaker in kept):
+            kept.append(clause)
+    return tuple(kept)
+
+
+class LogicProgram:
+    """
+    This class holds the logic expressions of every macro and location rule, flattened into disjunctive normal form
+    where doing so stays small.
+
+    When the option gates are known, option checks are folded into constants before flattening, so branches that can
+    never be taken under those options are pruned entirely. The program does not depend on a specific player, so every
+    world with the same option gates shares one program.
+
+    :param gates: The resolved option gates, or `None` to keep option checks as runtime checks.
+    """
+
+    def __init__(self, gates: Optional[LogicGates] = None) -> None:
+        self.gates = gates
+        self.macro_dnfs: dict[str, Optional[DNF]] = {}
+        self._macros_in_progress: set[str] = set()
+
+    def resolve(self, expression: Expression) -> Expression:
+        """
+        Fold an option check into a constant if the option gates are known.
+
+        :param expression: The expression to resolve.
+        :return: The constant value of the option check, or the unchanged expression.
+        """
+        if self.gates is not None and isinstance(expression, StateRequirement):
+            gate = OPTION_GATE_METHODS.get(expression.method_name)
+            if gate is not None:
+                field_name, negated = gate
+                return getattr(self.gates, field_name) ^ negated ^ expression.negated
+        return expression
+
+    def macro_dnf(self, macro_name: str) -> Optional[DNF]:
+        """
+        Retrieve the DNF of a macro, computing it on first use.
+
+        :param macro_name: The name of the macro.
+        :raises LogicCompileError: If the macro is unknown or could not be parsed.
+        :return: The DNF of the macro, or `None` if its DNF would be too large.
+        """
+        if macro_name in self.macro_dnfs:
+            return self.macro_dnfs[macro_name]
+        if macro_name not in MACRO_EXPRESSIONS:
+            raise LogicCompileError(f"Unknown macro: {macro_name}")
+        if macro_name in self._macros_in_progress:
+            raise LogicCompileError(f"Recursive macro: {macro_name}")
+
+        self._macros_in_progress.add(macro_name)
+        try:
+            dnf = self.to_dnf(MACRO_EXPRESSIONS[macro_name])
+        finally:
+            self._macros_in_progress.discard(macro_name)
+        self.macro_dnfs[macro_name] = dnf
+        return dnf
+
+    def to_dnf(self, expression: Expression) -> Optional[DNF]:
+        """
+        Flatten an expression into disjunctive normal form.
+
+        :param expression: The expression to flatten.
+        :return: The DNF of the expression, or `None` if its DNF would be too large.
+        """
+        expression = self.resolve(expression)
+
+        if expression is True:
+            return (frozenset(),)
+        if expression is False:
+            return ()
+        if isinstance(expression, MacroCall):
+            return self.macro_dnf(expression.macro_name)
+
+        if isinstance(expression, AnyOf):
+            clauses: list[Clause] = []
+            for child in expression.children:
+                child_dnf = self.to_dnf(child)
+                if child_dnf is None:
+                    return None
+                clauses.extend(child_dnf)
+            dnf = _minimize(clauses)
+            return dnf if len(dnf) <= MAX_DNF_CLAUSES else None
+
+        if isinstance(expression, AllOf):
+            dnf = (frozenset(),)
+            for child in expression.children:
+                child_dnf = self.to_dnf(child)
+                if child_dnf is None or len(dnf) * len(child_dnf) > MAX_DNF_PRODUCT:
+                    return None
+                products = [_merge_clauses(first, second) for first in dnf for second in child_dnf]
+                dnf = _minimize([clause for clause in products if clause is not None])
+                if len(dnf) > MAX_DNF_CLAUSES:
+                    return None
+                if not dnf:
+                    # The conjunction can never be satisfied.
+                    return ()
+            return dnf
+
+        return (frozenset((expression,)),)
+
+
+# The `TWWLogic` methods whose result only depends on the player's items, mapped to the items they may check.
+ITEM_STATE_METHOD_DEPENDENCIES: dict[str, frozenset[str]] = {
+    "_tww_has_chart_for_island": frozenset(
+        item_name_groups["Triforce Charts"] | item_name_groups["Treasure Charts"] | {"Progressive Wallet"}
+    ),
+}
+
+
+def _dnf_dependencies(dnf: DNF) -> Optional[frozenset[str]]:
+    """
+    Determine the items whose counts a DNF depends on.
+
+    :param dnf: The DNF to inspect.
+    :return: The names of the items the DNF depends on, or `None` if the DNF also depends on something other than the
+    player's items, such as region reachability.
+    """
+    dependencies: set[str] = set()
+    for clause in dnf:
+        for requirement in clause:
+            if isinstance(requirement, ItemRequirement):
+                dependencies.add(requirement.item_name)
+            elif isinstance(requirement, GroupRequirement):
+                dependencies.update(item_name_groups[requirement.group_name])
+            elif (
+                isinstance(requirement, StateRequirement)
+                and requirement.method_name in ITEM_STATE_METHOD_DEPENDENCIES
+            ):
+                dependencies.update(ITEM_STATE_METHOD_DEPENDENCIES[requirement.method_name])
+            else:
+                return None
+    return frozenset(dependencies)
+
+
+_LOGIC_PROGRAMS: dict[Optional[LogicGates], LogicProgram] = {}
+
+
+def get_logic_program(gates: Optional[LogicGates]) -> LogicProgram:
+    """
+    Retrieve the logic program for a set of option gates, creating it on first use.
+
+    :param gates: The resolved option gates, or `None` for a program that checks options at runtime.
+    :return: The logic program shared by all worlds with these option gates.
+    """
+    if gates not in _LOGIC_PROGRAMS:
+        _LOGIC_PROGRAMS[gates] = LogicProgram(gates)
+    return _LOGIC_PROGRAMS[gates]
+
+
+def _requirement_check(requirement: Requirement, player: int) -> Callable[["CollectionState"], bool]:
+    """
+    Build a callable that checks a requirement that cannot be expressed as an item count.
+
+    :param requirement: The requirement to check.
+    :param player: The player whose state is checked.
+    :return: A callable that takes a collection state and returns whether the requirement is met.
+    """
+    if isinstance(requirement, GroupRequirement):
+        group_items = tuple(sorted(item_name_groups[requirement.group_name]))
+        count = requirement.count
+
+        def check_group(state: "CollectionState") -> bool:
+            counts = state.prog_items[player]
+            found = 0
+            for item_name in group_items:
+                if counts[item_name] > 0:
+                    found += 1
+                    if found >= count:
+                        return True
+            return False
+
+        return check_group
+
+    if isinstance(requirement, RegionRequirement):
+        return methodcaller("can_reach_region", requirement.region_name, player)
+
+    if isinstance(requirement, StateRequirement):
+        call = methodcaller(requirement.method_name, player, *requirement.args)
+        if requirement.negated:
+            return lambda state: not call(state)
+        return call
+
+    raise LogicCompileError(f"Unsupported requirement: {requirement!r}")
+
+
+def _bind_dnf(dnf: DNF, player: int) -> Callable[["CollectionState"], bool]:
+    """
+    Build a rule callable that evaluates a DNF against a player's inventory.
+
+    Item requirements are compared directly against the player's item counts; the remaining requirements are only
+    checked once all item requirements of their clause are met.
+
+    :param dnf: The DNF to evaluate.
+    :param player: The player whose state is checked.
+    :return: A callable that takes a collection state and returns whether the rule is satisfied.
+    """
+    if not dnf:
+        return lambda state: False
+    if any(not clause for clause in dnf):
+        return lambda state: True
+
+    compiled_clauses: list[tuple[tuple[tuple[str, int], ...], tuple[Callable[["CollectionState"], bool], ...]]] = []
+    for clause in dnf:
+        item_counts = tuple(
+            sorted((req.item_name, req.count) for req in clause if isinstance(req, ItemRequirement))
+        )
+        # Region checks are the most expensive, so they are evaluated last.
+        other_requirements = sorted(
+            (req for req in clause if not isinstance(req, ItemRequirement)),
+            key=lambda req: (isinstance(req, RegionRequirement), repr(req)),
+        )
+        checks = tuple(_requirement_check(req, player) for req in other_requirements)
+        compiled_clauses.append((item_counts, checks))
+    # Clauses that only require items are the cheapest to evaluate, so try them first.
+    compiled_clauses.sort(key=lambda clause: len(clause[1]))
+    clauses = tuple(compiled_clauses)
+
+    def rule(state: "CollectionState") -> bool:
+        counts = state.prog_items[player]
+        for item_counts, checks in clauses:
+            for item_name, count in item_counts:
+                if counts[item_name] < count:
+                    break
+            else:
+                for check in checks:
+                    if not check(state):
+                        break
+                else:
+                    return True
+        return False
+
+    return rule
+
+
+class LogicCompiler:
+    """
+    This class compiles the human-readable logic in `Macros.py` and `Rules.py` into rule callables for a world.
+
+    Once specialized for the world's options, option checks are resolved at compile time. Each macro and location rule
+    is flattened into a disjunctive normal form of item count requirements, which is evaluated directly against the
+    player's item counts instead of walking the tree of macro calls. Expressions whose DNF would be too large keep their
+    structure, with each subexpression compiled separately.
+
+    Rules that only depend on the player's items cache their result on the collection state. The compiler keeps an
+    index from each item to the cached rules that mention it, so collecting or removing an item only invalidates the
+    results that item can affect. Setting `cache_rule_results` to `False` disables this cache (e.g., to benchmark it).
+
+    If the logic source cannot be parsed, no rules are compiled, and callers should fall back to the original rules.
+
+    :param world: The Wind Waker game world.
+    """
+
+    # Whether rules that only depend on the player's items cache their result on the collection state.
+    cache_rule_results: ClassVar[bool] = True
+
+    def __init__(self, world: "TWWWorld"):
+        self.world = world
+        self.player = world.player
+        self.program = get_logic_program(None)
+
+        self._macro_rules: dict[str, Callable[["CollectionState"], bool]] = {}
+        self._cached_rules: dict[Expression, Callable[["CollectionState"], bool]] = {}
+        self._dependent_slots: dict[str, list[int]] = {}
+
+    def specialize(self, gates: LogicGates) -> None:
+        """
+        Specialize the compiled rules for the world's resolved option gates.
+
+        This should be called once the world's options are final, before any rules are compiled.
+
+        :param gates: The world's resolved option gates.
+        """
+        self.program = get_logic_program(gates)
+        self._macro_rules.clear()
+        self._cached_rules.clear()
+        self._dependent_slots.clear()
+
+    def invalidate(self, state: "CollectionState", item_name: str) -> None:
+        """
+        Discard the cached rule results that depend on an item whose count changed.
+
+        :param state: The collection state whose item count changed.
+        :param item_name: The name of the item.
+        """
+        slots = self._dependent_slots.get(item_name)
+        if slots:
+            results = state._tww_rule_results[self.player]
+            for slot in slots:
+                results.pop(slot, None)
+
+    def macro_rule(self, macro_name: str) -> Optional[Callable[["CollectionState"], bool]]:
+        """
+        Retrieve the compiled rule for a macro.
+
+        :param macro_name: The name of the macro.
+        :return: The compiled rule, or `None` if the macro could not be compiled.
+        """
+        try:
+            return self._bind_cached(MacroCall(macro_name))
+        except LogicCompileError:
+            return None
+
+    def location_rule(self, location_name: str) -> Optional[Callable[["CollectionState"], bool]]:
+        """
+        Compile the rule for a location.
+
+        :param location_name: The name of the location.
+        :return: The compiled rule, or `None` if the location's rule could not be compiled.
+        """
+        expression = LOCATION_RULE_EXPRESSIONS.get(location_name)
+        if expression is None:
+            return None
+        try:
+            return self._bind_cached(expression)
+        except LogicCompileError:
+            return None
+
+    def _bind_cached(self, expression: Expression) -> Callable[["CollectionState"], bool]:
+        """
+        Build a rule callable for an expression that caches its result on the collection state, if possible.
+
+        :param expression: The expression to compile.
+        :raises LogicCompileError: If the expression could not be compiled.
+        :return: A callable that takes a collection state and returns whether the expression is satisfied.
+        """
+        if expression in self._cached_rules:
+            return self._cached_rules[expression]
+
+        rule = self._bind(expression)
+        dnf = self.program.to_dnf(expression)
+        dependencies = None if dnf is None else _dnf_dependencies(dnf)
+        if not dependencies or not self.cache_rule_results:
+            # Constant rules are already trivial, and rules that depend on more than items cannot be cached.
+            self._cached_rules[expression] = rule
+            return rule
+
+        slot = len(self._cached_rules)
+        for item_name in dependencies:
+            self._dependent_slots.setdefault(item_name, []).append(slot)
+        player = self.player
+
+        def cached_rule(state: "CollectionState") -> bool:
+            results = state._tww_rule_results[player]
+            result = results.get(slot)
+            if result is None:
+                result = results[slot] = rule(state)
+            return result
+
+        self._cached_rules[expression] = cached_rule
+        return cached_rule
+
+    def _bind(self, expression: Expression) -> Callable[["CollectionState"], bool]:
+        """
+        Build a rule callable for an expression.
+
+        :param expression: The expression to compile.
+        :raises LogicCompileError: If the expression could not be compiled.
+        :return: A callable that takes a collection state and returns whether the expression is satisfied.
+        """
+        if isinstance(expression, MacroCall) and expression.macro_name in self._macro_rules:
+            return self._macro_rules[expression.macro_name]
+
+        dnf = self.program.to_dnf(expression)
+        if dnf is not None:
+            rule = _bind_dnf(dnf, self.player)
+            if isinstance(expression, MacroCall):
+                self._macro_rules[expression.macro_name] = rule
+            return rule
+
+        expression = self.program.resolve(expression)
+        if isinstance(expression, bool):
+            constant = expression
+            return lambda state: constant
+        if isinstance(expression, MacroCall):
+            macro_name = expression.macro_name
+            if macro_name not in self._macro_rules:
+                self._macro_rules[macro_name] = self._bind(MACRO_EXPRESSIONS[macro_name])
+            return self._macro_rules[macro_name]
+
+        if isinstance(expression, (AllOf, AnyOf)):
+            parts = tuple(self._bind(child) for child in expression.children)
+            if isinstance(expression, AllOf):
+
+                def all_of(state: "CollectionState") -> bool:
+                    for part in parts:
+                        if not part(state):
+                            return False
+                    return True
+
+                return all_of
+
+            def any_of(state: "CollectionState") -> bool:
+                for part in parts:
+                    if part(state):
+                        return True
+                return False
+
+            return any_of
+
+        raise LogicCompileError(f"Could not compile expression: {expression!r}")
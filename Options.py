@@ -487,6 +487,20 @@ class MixEntrances(Choice):
     default = 0
 
 
+class EntranceRandomizationAttempts(Range):
+    """
+    Select how many times the entrance randomizer may reshuffle the randomized entrances when it backs itself into a
+    corner before generation fails.
+
+    Only the entrances are reshuffled, so this is much faster than generating the whole multiworld again.
+    """
+
+    display_name = "Entrance Randomization Attempts"
+    range_start = 1
+    range_end = 100
+    default = 20
+
+
 class RandomizeEnemies(Toggle):
     """
     Randomizes the placement of non-boss enemies.
@@ -732,6 +746,7 @@ class TWWOptions(PerGameCommonOptions):
     randomize_secret_cave_inner_entrances: RandomizeSecretCaveInnerEntrances
     randomize_fairy_fountain_entrances: RandomizeFairyFountainEntrances
     mix_entrances: MixEntrances
+    entrance_randomization_attempts: EntranceRandomizationAttempts
     randomize_enemies: RandomizeEnemies
     # randomize_music: RandomizeMusic
     randomize_starting_island: RandomizeStartingIsland
@@ -803,6 +818,7 @@ tww_option_groups: list[OptionGroup] = [
             RandomizeSecretCaveInnerEntrances,
             RandomizeFairyFountainEntrances,
             MixEntrances,
+            EntranceRandomizationAttempts,
         ],
     ),
     OptionGroup(
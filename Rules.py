@@ -17,12 +17,22 @@ class TWWLogic(LogicMixin):
     """
     This class implements some of the game logic for The Wind Waker.
 
-    This class's methods reference the world's options. All methods defined in this class should be prefixed with
-    "_tww."
+    This class's methods reference the world's options, which are resolved once into the world's logic gates. All
+    methods defined in this class should be prefixed with "_tww."
     """
 
     multiworld: MultiWorld
 
+    # The cached results of compiled rules, keyed by player and then by the rule's slot in the world's logic compiler.
+    _tww_rule_results: dict[int, dict[int, bool]]
+
+    def init_mixin(self, multiworld: MultiWorld) -> None:
+        self._tww_rule_results = {player: {} for player in multiworld.get_game_players("The Wind Waker")}
+
+    def copy_mixin(self, new_state: "TWWLogic") -> "TWWLogic":
+        new_state._tww_rule_results = {player: results.copy() for player, results in self._tww_rule_results.items()}
+        return new_state
+
     def _tww_has_chart_for_island(self, player: int, island_number: int) -> bool:
         chart_item_name = self.multiworld.worlds[player].charts.island_number_to_chart_name[island_number]
 
@@ -36,54 +46,40 @@ class TWWLogic(LogicMixin):
         return all(self.can_reach_location(loc, player) for loc in required_boss_item_locations)
 
     def _tww_rematch_bosses_skipped(self, player: int) -> bool:
-        return self.multiworld.worlds[player].options.skip_rematch_bosses
+        return self.multiworld.worlds[player].logic_gates.rematch_bosses_skipped
 
     def _tww_in_swordless_mode(self, player: int) -> bool:
-        return self.multiworld.worlds[player].options.sword_mode in ("swords_optional", "swordless")
+        return self.multiworld.worlds[player].logic_gates.in_swordless_mode
 
     def _tww_outside_swordless_mode(self, player: int) -> bool:
-        return self.multiworld.worlds[player].options.sword_mode not in ("swords_optional", "swordless")
+        return not self.multiworld.worlds[player].logic_gates.in_swordless_mode
 
     def _tww_in_required_bosses_mode(self, player: int) -> bool:
-        return self.multiworld.worlds[player].options.required_bosses
+        return self.multiworld.worlds[player].logic_gates.in_required_bosses_mode
 
     def _tww_outside_required_bosses_mode(self, player: int) -> bool:
-        return not self.multiworld.worlds[player].options.required_bosses
+        return not self.multiworld.worlds[player].logic_gates.in_required_bosses_mode
 
     def _tww_obscure_1(self, player: int) -> bool:
-        return (
-            self.multiworld.worlds[player].options.logic_obscurity == "normal"
-            or self.multiworld.worlds[player].options.logic_obscurity == "hard"
-            or self.multiworld.worlds[player].options.logic_obscurity == "very_hard"
-        )
+        return self.multiworld.worlds[player].logic_gates.obscure_1
 
     def _tww_obscure_2(self, player: int) -> bool:
-        return (
-            self.multiworld.worlds[player].options.logic_obscurity == "hard"
-            or self.multiworld.worlds[player].options.logic_obscurity == "very_hard"
-        )
+        return self.multiworld.worlds[player].logic_gates.obscure_2
 
     def _tww_obscure_3(self, player: int) -> bool:
-        return self.multiworld.worlds[player].options.logic_obscurity == "very_hard"
+        return self.multiworld.worlds[player].logic_gates.obscure_3
 
     def _tww_precise_1(self, player: int) -> bool:
-        return (
-            self.multiworld.worlds[player].options.logic_precision == "normal"
-            or self.multiworld.worlds[player].options.logic_precision == "hard"
-            or self.multiworld.worlds[player].options.logic_precision == "very_hard"
-        )
+        return self.multiworld.worlds[player].logic_gates.precise_1
 
     def _tww_precise_2(self, player: int) -> bool:
-        return (
-            self.multiworld.worlds[player].options.logic_precision == "hard"
-            or self.multiworld.worlds[player].options.logic_precision == "very_hard"
-        )
+        return self.multiworld.worlds[player].logic_gates.precise_2
 
     def _tww_precise_3(self, player: int) -> bool:
-        return self.multiworld.worlds[player].options.logic_precision == "very_hard"
+        return self.multiworld.worlds[player].logic_gates.precise_3
 
     def _tww_tuner_logic_enabled(self, player: int) -> bool:
-        return self.multiworld.worlds[player].options.enable_tuner_logic
+        return self.multiworld.worlds[player].logic_gates.tuner_logic_enabled
 
 
 def set_rules(world: "TWWWorld") -> None:  # noqa: F405
@@ -96,7 +92,9 @@ def set_rules(world: "TWWWorld") -> None:  # noqa: F405
 
     def set_rule_if_exists(location_name: str, rule: Callable[[CollectionState], bool]) -> None:
         if location_name in world.progress_locations:
-            set_rule(world.get_location(location_name), rule)
+            # Prefer the compiled version of the rule, falling back to the rule as written here.
+            compiled_rule = world.logic_compiler.location_rule(location_name)
+            set_rule(world.get_location(location_name), rule if compiled_rule is None else compiled_rule)
 
     player = world.player
 
@@ -1,7 +1,12 @@
 import asyncio
+import json
+import random
 import time
 import traceback
-from typing import TYPE_CHECKING, Any, Optional
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional, Protocol, TextIO, TypeVar
 
 import dolphin_memory_engine
 
@@ -16,11 +21,13 @@ from .randomizers.Charts import ISLAND_NUMBER_TO_NAME
 if TYPE_CHECKING:
     import kvui
 
+T = TypeVar("T")
+
 CONNECTION_REFUSED_GAME_STATUS = (
-    "Dolphin failed to connect. Please load a randomized ROM for The Wind Waker. Trying again in 5 seconds..."
+    "Dolphin failed to connect. Please load a randomized ROM for The Wind Waker. Trying again shortly..."
 )
 CONNECTION_REFUSED_SAVE_STATUS = (
-    "Dolphin failed to connect. Please load into the save file. Trying again in 5 seconds..."
+    "Dolphin failed to connect. Please load into the save file. Trying again shortly..."
 )
 CONNECTION_LOST_STATUS = (
     "Dolphin connection was lost. Please restart your emulator and make sure The Wind Waker is running."
@@ -45,6 +52,10 @@ CURR_STAGE_CHESTS_BITFLD_ADDR = 0x803C5380
 CURR_STAGE_SWITCHES_BITFLD_ADDR = 0x803C5384
 CURR_STAGE_PICKUPS_BITFLD_ADDR = 0x803C5394
 
+# The saved bitfields of each stage are stored in a block of this size, starting at `BASE_CHESTS_BITFLD_ADDR`.
+STAGE_INFO_SIZE = 0x24
+NUM_SAVED_STAGES = 0xE
+
 # The expected index for the following item that should be received. Uses event bits 0x60 and 0x61.
 EXPECTED_INDEX_ADDR = 0x803C528C
 
@@ -88,6 +99,609 @@ CLIFF_PLATEAU_ISLES_HIGHEST_ISLE_DUMMY_STAGE_NAME = "CliPlaH"
 # Data storage key
 AP_VISITED_STAGE_NAMES_KEY_FORMAT = "tww_visited_stages_%i"
 
+# The intervals between two iterations of the Dolphin sync loop, in seconds. The loop polls quickly while the player is
+# active, and backs off once memory has stayed unchanged for a while.
+FAST_POLL_INTERVAL = 0.05
+DEFAULT_POLL_INTERVAL = 0.1
+IDLE_POLL_INTERVAL = 0.5
+# The number of iterations after the last activity to keep polling quickly, and after which to consider the player idle.
+ACTIVE_POLL_TICKS = 20
+IDLE_POLL_TICKS = 50
+
+# The delays between attempts to reconnect to Dolphin, in seconds. The delay doubles after each failed attempt, and is
+# randomly shortened or lengthened by up to the jitter fraction so several clients do not retry in lockstep.
+MIN_RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+RECONNECT_DELAY_JITTER = 0.25
+
+# The largest gap between two memory ranges for which it is cheaper to read both with a single call.
+MAX_SNAPSHOT_RANGE_GAP = 0x400
+
+# The upper bounds of the buckets of the latency histograms, in milliseconds. Durations above the last bound fall into
+# an overflow bucket.
+LATENCY_BUCKET_BOUNDS_MS: tuple[float, ...] = (
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+    25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0, 10000.0,
+)
+
+# The stages of the client's check-to-server and server-to-game paths whose latencies are measured.
+LATENCY_STAGES: tuple[str, ...] = (
+    # Reading the memory used to check locations from Dolphin.
+    "memory_read",
+    # Evaluating the check plan against the memory that was read.
+    "check_evaluation",
+    # From reading the memory in which a location was newly checked to sending the `LocationChecks` message.
+    "check_send",
+    # From receiving an item in a `ReceivedItems` package to writing it to the give item array.
+    "item_queue_wait",
+    # Writing a batch of items to the give item array.
+    "item_write",
+)
+
+
+class MemoryBackend(Protocol):
+    """
+    This class defines the interface through which the client accesses the console's memory.
+    """
+
+    def hook(self) -> None:
+        """
+        Attempt to connect to the console.
+        """
+        ...
+
+    def un_hook(self) -> None:
+        """
+        Disconnect from the console.
+        """
+        ...
+
+    def is_hooked(self) -> bool:
+        """
+        Check whether the backend is connected to the console.
+
+        :return: `True` if connected, otherwise `False`.
+        """
+        ...
+
+    def read_bytes(self, console_address: int, size: int) -> bytes:
+        """
+        Read bytes from the console's memory.
+
+        :param console_address: Address to start reading from.
+        :param size: The number of bytes to read.
+        :return: The bytes read.
+        """
+        ...
+
+    def write_bytes(self, console_address: int, data: bytes) -> None:
+        """
+        Write bytes to the console's memory.
+
+        :param console_address: Address to start writing to.
+        :param data: The bytes to write.
+        """
+        ...
+
+
+class DolphinMemoryBackend:
+    """
+    This class accesses the memory of the game running in Dolphin through `dolphin_memory_engine`.
+    """
+
+    def hook(self) -> None:
+        dolphin_memory_engine.hook()
+
+    def un_hook(self) -> None:
+        dolphin_memory_engine.un_hook()
+
+    def is_hooked(self) -> bool:
+        return dolphin_memory_engine.is_hooked()
+
+    def read_bytes(self, console_address: int, size: int) -> bytes:
+        return dolphin_memory_engine.read_bytes(console_address, size)
+
+    def write_bytes(self, console_address: int, data: bytes) -> None:
+        dolphin_memory_engine.write_bytes(console_address, data)
+
+
+# The backend through which the client accesses the console's memory.
+memory_backend: MemoryBackend = DolphinMemoryBackend()
+
+
+def set_memory_backend(backend: MemoryBackend) -> None:
+    """
+    Replace the backend through which the client accesses the console's memory.
+
+    This allows the client to run against an in-process stand-in for Dolphin, e.g., for load testing.
+
+    :param backend: The new memory backend.
+    """
+    global memory_backend
+    memory_backend = backend
+
+
+class DolphinIO:
+    """
+    This class runs the client's accesses to the console's memory on a dedicated thread.
+
+    The memory backend makes blocking calls into Dolphin. Running them on the asyncio event loop, which is shared with
+    the server connection and the GUI, would stall both whenever Dolphin is slow to respond. Instead, every access is
+    run in order on a single thread, which is the only thread that uses the memory backend, and the event loop awaits
+    the result.
+    """
+
+    def __init__(self) -> None:
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    async def run(self, function: Callable[..., T], *args: Any) -> T:
+        """
+        Run a function that accesses the console's memory on the I/O thread.
+
+        :param function: The function to run.
+        :param args: The arguments to pass to the function.
+        :return: The function's return value.
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="DolphinIO")
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    def shutdown(self) -> None:
+        """
+        Stop the I/O thread once it has finished its current access.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+
+# Runs the client's accesses to the console's memory off the asyncio event loop.
+dolphin_io: DolphinIO = DolphinIO()
+
+
+class MemoryRange(NamedTuple):
+    """
+    This class represents a contiguous range of console memory.
+
+    :param start: The address of the first byte of the range.
+    :param size: The number of bytes in the range.
+    """
+
+    start: int
+    size: int
+
+    @property
+    def end(self) -> int:
+        """
+        Retrieve the address directly after the last byte of the range.
+
+        :return: The end address of the range.
+        """
+        return self.start + self.size
+
+
+def merge_memory_ranges(
+    ranges: Iterable[MemoryRange], max_gap: int = MAX_SNAPSHOT_RANGE_GAP
+) -> tuple[MemoryRange, ...]:
+    """
+    Merge memory ranges that overlap or are close to each other into as few contiguous ranges as possible.
+
+    :param ranges: The memory ranges to merge.
+    :param max_gap: The largest number of unused bytes between two ranges for them to be merged.
+    :return: The merged memory ranges, sorted by address.
+    """
+    merged: list[MemoryRange] = []
+    for memory_range in sorted(ranges):
+        if merged and memory_range.start - merged[-1].end <= max_gap:
+            previous = merged[-1]
+            merged[-1] = MemoryRange(previous.start, max(previous.end, memory_range.end) - previous.start)
+        else:
+            merged.append(memory_range)
+    return tuple(merged)
+
+
+def _get_location_memory_ranges() -> list[MemoryRange]:
+    """
+    Get the memory ranges that are read to determine which locations the player has checked.
+
+    :return: The memory ranges referenced by the location table and the stage bitfields.
+    """
+    ranges = [
+        MemoryRange(CHARTS_BITFLD_ADDR, 8),
+        MemoryRange(LETTER_BASE_ADDR, 8),
+        MemoryRange(LETTER_OWND_ADDR, 4),
+        MemoryRange(TINGLE_STATUE_1_ADDR, 1),
+        MemoryRange(TINGLE_STATUE_2_ADDR, 1),
+        MemoryRange(BASE_CHESTS_BITFLD_ADDR, STAGE_INFO_SIZE * NUM_SAVED_STAGES),
+        MemoryRange(CURR_STAGE_CHESTS_BITFLD_ADDR, CURR_STAGE_PICKUPS_BITFLD_ADDR + 4 - CURR_STAGE_CHESTS_BITFLD_ADDR),
+        MemoryRange(CURR_STAGE_ID_ADDR, 1),
+    ]
+    for data in LOCATION_TABLE.values():
+        if data.address is not None:
+            ranges.append(MemoryRange(data.address, 2 if data.type == TWWLocationType.BOCTO else 1))
+    return ranges
+
+
+# The few contiguous memory ranges that cover every address needed to check locations.
+LOCATION_MEMORY_RANGES: tuple[MemoryRange, ...] = merge_memory_ranges(_get_location_memory_ranges())
+
+
+class MemorySnapshot:
+    """
+    This class holds a copy of several ranges of console memory.
+
+    Each range is read from Dolphin with a single call, and all subsequent reads are served from the local copy.
+
+    :param ranges: The memory ranges in the snapshot, sorted by address.
+    :param buffers: The contents of each memory range.
+    """
+
+    def __init__(self, ranges: Sequence[MemoryRange], buffers: Sequence[bytes]):
+        self.ranges = ranges
+        self.buffers = [memoryview(buffer) for buffer in buffers]
+        self._starts = [memory_range.start for memory_range in ranges]
+
+    @classmethod
+    def read(cls, ranges: Sequence[MemoryRange]) -> "MemorySnapshot":
+        """
+        Read a snapshot of the given memory ranges from the console.
+
+        :param ranges: The memory ranges to read, sorted by address.
+        :return: The memory snapshot.
+        """
+        buffers = [memory_backend.read_bytes(memory_range.start, memory_range.size) for memory_range in ranges]
+        return cls(ranges, buffers)
+
+    def read_bytes(self, console_address: int, size: int) -> memoryview:
+        """
+        Read bytes from the snapshot.
+
+        :param console_address: Address to start reading from.
+        :param size: The number of bytes to read.
+        :raises ValueError: If the bytes are not part of the snapshot.
+        :return: The bytes read.
+        """
+        index = bisect_right(self._starts, console_address) - 1
+        if index >= 0:
+            offset = console_address - self._starts[index]
+            if offset + size <= self.ranges[index].size:
+                return self.buffers[index][offset : offset + size]
+        raise ValueError(f"Address range {console_address:#X}+{size:#X} is not in the memory snapshot")
+
+    def diff(self, previous: "MemorySnapshot") -> dict[int, int]:
+        """
+        Compare the snapshot to a previous snapshot of the same memory ranges.
+
+        :param previous: The previous snapshot.
+        :return: A dictionary mapping the address of every byte that changed to the bits that changed in that byte.
+        """
+        changed: dict[int, int] = {}
+        for memory_range, buffer, previous_buffer in zip(self.ranges, self.buffers, previous.buffers):
+            if buffer == previous_buffer:
+                continue
+            xor = int.from_bytes(buffer, byteorder="big") ^ int.from_bytes(previous_buffer, byteorder="big")
+            for offset, value in enumerate(xor.to_bytes(memory_range.size, byteorder="big")):
+                if value:
+                    changed[memory_range.start + offset] = value
+        return changed
+
+    def read_byte(self, console_address: int) -> int:
+        """
+        Read a byte from the snapshot.
+
+        :param console_address: Address to read from.
+        :return: The value read.
+        """
+        return self.read_bytes(console_address, 1)[0]
+
+    def read_short(self, console_address: int) -> int:
+        """
+        Read a 2-byte short from the snapshot.
+
+        :param console_address: Address to read from.
+        :return: The value read.
+        """
+        return int.from_bytes(self.read_bytes(console_address, 2), byteorder="big")
+
+    def read_word(self, console_address: int) -> int:
+        """
+        Read a 4-byte word from the snapshot.
+
+        :param console_address: Address to read from.
+        :return: The value read.
+        """
+        return int.from_bytes(self.read_bytes(console_address, 4), byteorder="big")
+
+
+class PollScheduler:
+    """
+    This class determines how long the Dolphin sync loop waits between iterations.
+
+    While connected, the loop polls quickly right after any activity in memory, such as a stage change or a newly
+    checked location, and while there are items to give to the player. It polls more slowly once memory has been
+    unchanged for several iterations. While disconnected, reconnection attempts use exponential backoff with jitter.
+    """
+
+    def __init__(self) -> None:
+        self.idle_ticks: int = ACTIVE_POLL_TICKS
+        self.reconnect_attempts: int = 0
+
+    def next_poll_interval(self, active: bool = False, items_pending: bool = False) -> float:
+        """
+        Determine the delay before the next iteration of the sync loop while connected.
+
+        :param active: Whether there was any activity in memory during this iteration. Defaults to `False`.
+        :param items_pending: Whether there are items being given to the player. Defaults to `False`.
+        :return: The delay in seconds.
+        """
+        if active:
+            self.idle_ticks = 0
+        else:
+            self.idle_ticks += 1
+
+        if items_pending or self.idle_ticks < ACTIVE_POLL_TICKS:
+            return FAST_POLL_INTERVAL
+        if self.idle_ticks >= IDLE_POLL_TICKS:
+            return IDLE_POLL_INTERVAL
+        return DEFAULT_POLL_INTERVAL
+
+    def next_reconnect_delay(self) -> float:
+        """
+        Determine the delay before the next attempt to reconnect to Dolphin.
+
+        :return: The delay in seconds.
+        """
+        delay = min(MAX_RECONNECT_DELAY, MIN_RECONNECT_DELAY * 2**self.reconnect_attempts)
+        self.reconnect_attempts += 1
+        self.idle_ticks = ACTIVE_POLL_TICKS
+        return delay * random.uniform(1 - RECONNECT_DELAY_JITTER, 1 + RECONNECT_DELAY_JITTER)
+
+    def reset_reconnect_delay(self) -> None:
+        """
+        Reset the reconnection delay after successfully connecting to Dolphin.
+        """
+        self.reconnect_attempts = 0
+
+
+class LatencyHistogram:
+    """
+    This class accumulates durations into fixed buckets, so that recording a duration takes constant time and memory.
+    """
+
+    def __init__(self) -> None:
+        self.bucket_counts: list[int] = [0] * (len(LATENCY_BUCKET_BOUNDS_MS) + 1)
+        self.count: int = 0
+        self.total_ms: float = 0.0
+        self.max_ms: float = 0.0
+
+    def record(self, duration: float) -> None:
+        """
+        Record a duration.
+
+        :param duration: The duration, in seconds.
+        """
+        duration_ms = duration * 1000
+        self.bucket_counts[bisect_left(LATENCY_BUCKET_BOUNDS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Estimate a percentile of the recorded durations.
+
+        :param fraction: The percentile, as a fraction between 0 and 1.
+        :return: The upper bound of the bucket that contains the percentile, in milliseconds, or the maximum duration if
+            it is lower.
+        """
+        rank = fraction * self.count
+        cumulative = 0
+        for bound, bucket_count in zip(LATENCY_BUCKET_BOUNDS_MS, self.bucket_counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Summarize the recorded durations.
+
+        :return: The count, mean, estimated median and 95th and 99th percentiles, and maximum of the durations, in
+            milliseconds.
+        """
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ms,
+        }
+
+
+class LatencyStats:
+    """
+    This class measures the latency of each stage of the client's check-to-server and server-to-game paths.
+
+    Each stage has its own histogram. While a log file is open, every recorded duration is also written to it as a line
+    of JSON.
+
+    Since the client only sees memory when it polls Dolphin, the latency of a check is measured from the memory read in
+    which the location was first seen as checked. It does not include the time since the game set its bit, which is at
+    most one poll interval.
+    """
+
+    def __init__(self) -> None:
+        self.histograms: dict[str, LatencyHistogram] = {stage: LatencyHistogram() for stage in LATENCY_STAGES}
+        self.log_file: Optional[TextIO] = None
+
+        # The times at which the items that have yet to be given to the player were received, keyed by item index.
+        self.item_received_times: dict[int, float] = {}
+
+    def record(self, stage: str, duration: float) -> None:
+        """
+        Record the duration of a stage.
+
+        :param stage: The name of the stage.
+        :param duration: The duration, in seconds.
+        """
+        self.histograms[stage].record(duration)
+        if self.log_file is not None:
+            entry = {"time": time.time(), "stage": stage, "duration_ms": duration * 1000}
+            self.log_file.write(json.dumps(entry) + "\n")
+
+    def item_received(self, index: int) -> None:
+        """
+        Record that an item was received from the server.
+
+        :param index: The index of the item.
+        """
+        self.item_received_times.setdefault(index, time.perf_counter())
+
+    def item_given(self, index: int, given_time: float) -> None:
+        """
+        Record that an item was written to the give item array, measuring how long it waited to be given.
+
+        :param index: The index of the item.
+        :param given_time: The time at which the item was written.
+        """
+        received_time = self.item_received_times.pop(index, None)
+        if received_time is not None:
+            self.record("item_queue_wait", given_time - received_time)
+
+    def forget_items_before(self, index: int) -> None:
+        """
+        Stop tracking the items that the player had already received before they were sent by the server.
+
+        :param index: The index of the first item that the player has yet to receive.
+        """
+        if self.item_received_times and min(self.item_received_times) < index:
+            self.item_received_times = {
+                item_index: received_time
+                for item_index, received_time in self.item_received_times.items()
+                if item_index >= index
+            }
+
+    def reset(self) -> None:
+        """
+        Discard all recorded durations.
+        """
+        self.histograms = {stage: LatencyHistogram() for stage in LATENCY_STAGES}
+
+    def start_log(self, path: str) -> None:
+        """
+        Start writing every recorded duration to a file as lines of JSON, replacing any log file currently open.
+
+        :param path: The path of the file. Lines are appended if it already exists.
+        :raises OSError: If the file cannot be opened.
+        """
+        log_file = open(path, "a", encoding="utf-8", buffering=1)
+        self.stop_log()
+        self.log_file = log_file
+
+    def stop_log(self) -> None:
+        """
+        Stop writing recorded durations to the log file, if one is open.
+        """
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """
+        Summarize the recorded durations of each stage.
+
+        :return: The summary of each stage's histogram, keyed by stage name.
+        """
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+
+
+class ReceivedItemQueue:
+    """
+    This class holds the items received from the server, in order of their index.
+
+    The player's expected index, which is stored in their save file, acts as the watermark between the items they have
+    been given and those that are pending. Since the index can move back when the player reloads an older save, items
+    below the watermark are kept so they can be given again. Receiving a package of items takes time proportional to the
+    number of new items, and finding the pending items takes time proportional to the number of items requested.
+    """
+
+    def __init__(self) -> None:
+        self.items: list[NetworkItem] = []
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def receive(self, index: int, items: Sequence[NetworkItem]) -> range:
+        """
+        Add items received from the server.
+
+        Items at or after the given index are replaced. If the index is past the end of the queue, some items are
+        missing, so the items are ignored until the server resends them.
+
+        :param index: The index of the first item.
+        :param items: The items, in order of their index.
+        :return: The indices of the items that were added.
+        """
+        if index > len(self.items):
+            return range(0)
+        del self.items[index:]
+        self.items.extend(items)
+        return range(index, len(self.items))
+
+    def pending(self, expected_index: int, limit: int) -> list[tuple[int, NetworkItem]]:
+        """
+        Get the items that the player has yet to be given.
+
+        :param expected_index: The index of the next item the player expects to receive.
+        :param limit: The maximum number of items to get.
+        :return: The pending items with their indices, in order of their index.
+        """
+        end = min(len(self.items), expected_index + limit)
+        return [(idx, self.items[idx]) for idx in range(expected_index, end)]
+
+    def clear(self) -> None:
+        """
+        Remove all items from the queue.
+        """
+        self.items = []
+
+
+def coalesce_msgs(msgs: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Merge messages to the server that can be sent as one.
+
+    All `LocationChecks` messages are merged into the first one. `Set` messages of the same key that only `update` a
+    dictionary are merged into the first one of that key. All other messages are kept as they are. The order of the
+    messages is otherwise preserved.
+
+    :param msgs: The messages to merge.
+    :return: The merged messages.
+    """
+    coalesced: list[dict[str, Any]] = []
+    location_checks: Optional[dict[str, Any]] = None
+    dict_updates: dict[str, dict[str, Any]] = {}
+    for msg in msgs:
+        if msg["cmd"] == "LocationChecks":
+            if location_checks is None:
+                location_checks = {"cmd": "LocationChecks", "locations": set(msg["locations"])}
+                coalesced.append(location_checks)
+            else:
+                location_checks["locations"].update(msg["locations"])
+        elif msg["cmd"] == "Set" and all(operation["operation"] == "update" for operation in msg["operations"]):
+            dict_update = dict_updates.get(msg["key"])
+            if dict_update is None:
+                dict_update = {**msg, "operations": [{"operation": "update", "value": {}}]}
+                dict_updates[msg["key"]] = dict_update
+                coalesced.append(dict_update)
+            for operation in msg["operations"]:
+                dict_update["operations"][0]["value"].update(operation["value"])
+        else:
+            coalesced.append(msg)
+    return coalesced
+
 
 class TWWCommandProcessor(ClientCommandProcessor):
     """
@@ -111,6 +725,38 @@ class TWWCommandProcessor(ClientCommandProcessor):
         if isinstance(self.ctx, TWWContext):
             logger.info(f"Dolphin Status: {self.ctx.dolphin_status}")
 
+    def _cmd_stats(self, log_file: str = "") -> None:
+        """
+        Display the client's latency statistics. Pass a file path to also log every measurement to it as JSON lines,
+        "off" to stop logging, or "reset" to clear the statistics.
+        """
+        if not isinstance(self.ctx, TWWContext):
+            return
+        stats = self.ctx.latency_stats
+        if log_file == "off":
+            stats.stop_log()
+            logger.info("Stopped logging latency measurements.")
+        elif log_file == "reset":
+            stats.reset()
+            logger.info("Cleared latency statistics.")
+        elif log_file:
+            try:
+                stats.start_log(log_file)
+            except OSError as e:
+                logger.error(f"Could not open {log_file} for logging latency measurements: {e}")
+                return
+            logger.info(f"Logging latency measurements to {log_file}.")
+        else:
+            for stage, summary in stats.summary().items():
+                if summary["count"]:
+                    logger.info(
+                        f"{stage}: {summary['count']} samples, mean {summary['mean_ms']:.2f} ms, "
+                        f"p50 {summary['p50_ms']:.2f} ms, p95 {summary['p95_ms']:.2f} ms, "
+                        f"p99 {summary['p99_ms']:.2f} ms, max {summary['max_ms']:.2f} ms"
+                    )
+                else:
+                    logger.info(f"{stage}: no samples")
+
 
 class TWWContext(CommonContext):
     """
@@ -132,21 +778,20 @@ class TWWContext(CommonContext):
         """
 
         super().__init__(server_address, password)
-        self.items_received_2: list[tuple[NetworkItem, int]] = []
+        # The items received from the server, from which the player is given the items they have yet to receive.
+        self.received_items: ReceivedItemQueue = ReceivedItemQueue()
         self.dolphin_sync_task: Optional[asyncio.Task[None]] = None
         self.dolphin_status: str = CONNECTION_INITIAL_STATUS
         self.awaiting_rom: bool = False
-        self.last_rcvd_index: int = -1
         self.has_send_death: bool = False
 
-        # Bitfields used for checking locations.
-        self.charts_bitfield: int
-        self.chests_bitfields: dict[int, int]
-        self.switches_bitfields: dict[int, int]
-        self.pickups_bitfields: dict[int, int]
-        self.curr_stage_chests_bitfield: int
-        self.curr_stage_switches_bitfield: int
-        self.curr_stage_pickups_bitfield: int
+        # The compiled checks for the locations that the player has yet to check. It is built when it is first needed
+        # after connecting to the server or Dolphin.
+        self.check_plan: Optional[LocationCheckPlan] = None
+
+        # The memory snapshot from the last time locations were checked. Only the bits that changed since then are
+        # evaluated. It is reset whenever the check plan is rebuilt.
+        self.location_snapshot: Optional[MemorySnapshot] = None
 
         # Keep track of whether the player has yet received their first progressive magic meter.
         self.received_magic: bool = False
@@ -168,6 +813,22 @@ class TWWContext(CommonContext):
         # Length of the item get array in memory.
         self.len_give_item_array: int = 0x10
 
+        # Determines the delays of the Dolphin sync loop.
+        self.poll_scheduler: PollScheduler = PollScheduler()
+
+        # Measures the latency of checking locations and giving items, which is displayed with the `/stats` command.
+        self.latency_stats: LatencyStats = LatencyStats()
+
+        # Messages to the server produced during an iteration of the Dolphin sync loop. They are merged and sent as a
+        # single batch at the end of the iteration.
+        self.outbound_msgs: list[dict[str, Any]] = []
+
+        # Locations that have been sent to the server, but that the server has yet to acknowledge as checked.
+        self.location_checks_in_flight: set[int] = set()
+
+        # The time at which the memory for the earliest queued location check was read.
+        self.location_checks_read_time: Optional[float] = None
+
     async def disconnect(self, allow_autoreconnect: bool = False) -> None:
         """
         Disconnect the client from the server and reset game state variables.
@@ -177,10 +838,22 @@ class TWWContext(CommonContext):
         """
         self.auth = None
         self.salvage_locations_map = {}
+        self.check_plan = None
+        self.location_snapshot = None
         self.current_stage_name = ""
         self.visited_stage_names = None
+        self.outbound_msgs = []
+        self.location_checks_in_flight = set()
+        self.location_checks_read_time = None
         await super().disconnect(allow_autoreconnect)
 
+    async def shutdown(self) -> None:
+        """
+        Shut down the client, closing the latency log file if one is open.
+        """
+        await super().shutdown()
+        self.latency_stats.stop_log()
+
     async def server_auth(self, password_requested: bool = False) -> None:
         """
         Authenticate with the Archipelago server.
@@ -205,21 +878,25 @@ class TWWContext(CommonContext):
         :param args: The command arguments.
         """
         if cmd == "Connected":
-            self.items_received_2 = []
-            self.last_rcvd_index = -1
-            self.update_salvage_locations_map()
+            self.received_items.clear()
+            self.latency_stats.item_received_times = {}
+            # The salvage locations map is read again from memory when the check plan is next built.
+            self.check_plan = None
+            self.location_checks_in_flight = set()
             if "death_link" in args["slot_data"]:
                 Utils.async_start(self.update_death_link(bool(args["slot_data"]["death_link"])))
             # Request the connected slot's dictionary (used as a set) of visited stages.
             visited_stages_key = AP_VISITED_STAGE_NAMES_KEY_FORMAT % self.slot
             Utils.async_start(self.send_msgs([{"cmd": "Get", "keys": [visited_stages_key]}]))
         elif cmd == "ReceivedItems":
-            if args["index"] >= self.last_rcvd_index:
-                self.last_rcvd_index = args["index"]
-                for item in args["items"]:
-                    self.items_received_2.append((item, self.last_rcvd_index))
-                    self.last_rcvd_index += 1
-            self.items_received_2.sort(key=lambda v: v[1])
+            for idx in self.received_items.receive(args["index"], args["items"]):
+                self.latency_stats.item_received(idx)
+        elif cmd == "RoomUpdate":
+            # Stop checking locations that the server already knows have been checked.
+            if "checked_locations" in args:
+                self.location_checks_in_flight.difference_update(args["checked_locations"])
+                if self.check_plan is not None:
+                    self.check_plan.discard(args["checked_locations"])
         elif cmd == "Retrieved":
             requested_keys_dict = args["keys"]
             # Read the connected slot's dictionary (used as a set) of visited stages.
@@ -234,7 +911,7 @@ class TWWContext(CommonContext):
                     current_stage_name = self.current_stage_name
                     if current_stage_name and current_stage_name not in visited_stage_names:
                         visited_stage_names.add(current_stage_name)
-                        Utils.async_start(self.update_visited_stages(current_stage_name))
+                        self.update_visited_stages(current_stage_name)
                     self.visited_stage_names = visited_stage_names
 
     def on_deathlink(self, data: dict[str, Any]) -> None:
@@ -244,7 +921,7 @@ class TWWContext(CommonContext):
         :param data: The data associated with the DeathLink event.
         """
         super().on_deathlink(data)
-        _give_death(self)
+        Utils.async_start(_give_death(self))
 
     def make_gui(self) -> type["kvui.GameManager"]:
         """
@@ -256,7 +933,42 @@ class TWWContext(CommonContext):
         ui.base_title = "Archipelago The Wind Waker Client"
         return ui
 
-    async def update_visited_stages(self, newly_visited_stage_name: str) -> None:
+    def queue_msgs(self, msgs: Iterable[dict[str, Any]]) -> None:
+        """
+        Queue messages to be sent to the server with the next batch.
+
+        :param msgs: The messages to send.
+        """
+        self.outbound_msgs.extend(msgs)
+
+    async def flush_msgs(self) -> None:
+        """
+        Send all queued messages to the server as a single batch.
+
+        The queued messages are merged first. Locations that the server already knows have been checked, or that have
+        already been sent and are awaiting acknowledgement, are not sent again.
+        """
+        if not self.outbound_msgs:
+            return
+        msgs = coalesce_msgs(self.outbound_msgs)
+        self.outbound_msgs = []
+
+        sent_location_checks = False
+        for msg in msgs:
+            if msg["cmd"] == "LocationChecks":
+                locations = msg["locations"] - self.checked_locations - self.location_checks_in_flight
+                msg["locations"] = locations
+                self.location_checks_in_flight |= locations
+                sent_location_checks = bool(locations)
+        msgs = [msg for msg in msgs if msg["cmd"] != "LocationChecks" or msg["locations"]]
+        if msgs:
+            await self.send_msgs(msgs)
+
+        if sent_location_checks and self.location_checks_read_time is not None:
+            self.latency_stats.record("check_send", time.perf_counter() - self.location_checks_read_time)
+        self.location_checks_read_time = None
+
+    def update_visited_stages(self, newly_visited_stage_name: str) -> None:
         """
         Update the server's data storage of the visited stage names to include the newly visited stage name.
 
@@ -264,7 +976,7 @@ class TWWContext(CommonContext):
         """
         if self.slot is not None:
             visited_stages_key = AP_VISITED_STAGE_NAMES_KEY_FORMAT % self.slot
-            await self.send_msgs(
+            self.queue_msgs(
                 [
                     {
                         "cmd": "Set",
@@ -276,22 +988,27 @@ class TWWContext(CommonContext):
                 ]
             )
 
-    def update_salvage_locations_map(self) -> None:
+    def build_check_plan(self) -> None:
         """
-        Update the client's mapping of salvage locations to their bitfield bit.
+        Build the compiled checks for the locations that the player has yet to check.
 
-        This is necessary for the client to handle randomized charts correctly.
+        This must be called after the salvage locations map has been read.
         """
-        self.salvage_locations_map = {}
-        for offset in range(49):
-            island_name = ISLAND_NUMBER_TO_NAME[offset + 1]
-            salvage_bit = ISLAND_NAME_TO_SALVAGE_BIT[island_name]
+        self.check_plan = LocationCheckPlan(self.salvage_locations_map)
+        self.check_plan.discard(self.checked_locations)
+        self.check_plan.discard(self.locations_checked)
+        if self.finished_game:
+            self.check_plan.discard([None])
 
-            shuffled_island_number = read_short(CHARTS_MAPPING_ADDR + offset * 2)
-            shuffled_island_name = ISLAND_NUMBER_TO_NAME[shuffled_island_number]
-            salvage_location_name = f"{shuffled_island_name} - Sunken Treasure"
 
-            self.salvage_locations_map[salvage_location_name] = salvage_bit
+def read_byte(console_address: int) -> int:
+    """
+    Read a byte from Dolphin memory.
+
+    :param console_address: Address to read from.
+    :return: The value read from memory.
+    """
+    return memory_backend.read_bytes(console_address, 1)[0]
 
 
 def read_short(console_address: int) -> int:
@@ -301,7 +1018,7 @@ def read_short(console_address: int) -> int:
     :param console_address: Address to read from.
     :return: The value read from memory.
     """
-    return int.from_bytes(dolphin_memory_engine.read_bytes(console_address, 2), byteorder="big")
+    return int.from_bytes(memory_backend.read_bytes(console_address, 2), byteorder="big")
 
 
 def write_short(console_address: int, value: int) -> None:
@@ -311,7 +1028,7 @@ def write_short(console_address: int, value: int) -> None:
     :param console_address: Address to write to.
     :param value: Value to write.
     """
-    dolphin_memory_engine.write_bytes(console_address, value.to_bytes(2, byteorder="big"))
+    memory_backend.write_bytes(console_address, value.to_bytes(2, byteorder="big"))
 
 
 def read_string(console_address: int, strlen: int) -> str:
@@ -322,84 +1039,180 @@ def read_string(console_address: int, strlen: int) -> str:
     :param strlen: Length of the string to read.
     :return: The string.
     """
-    return dolphin_memory_engine.read_bytes(console_address, strlen).split(b"\0", 1)[0].decode()
+    return memory_backend.read_bytes(console_address, strlen).split(b"\0", 1)[0].decode()
 
 
-def _give_death(ctx: TWWContext) -> None:
+def read_salvage_locations_map() -> dict[str, int]:
+    """
+    Read the mapping of salvage locations to their sunken treasure bit from the randomized charts in memory.
+
+    :return: The mapping of salvage location names to their bit.
+    """
+    charts_mapping = memory_backend.read_bytes(CHARTS_MAPPING_ADDR, 49 * 2)
+    salvage_locations_map: dict[str, int] = {}
+    for offset in range(49):
+        island_name = ISLAND_NUMBER_TO_NAME[offset + 1]
+        salvage_bit = ISLAND_NAME_TO_SALVAGE_BIT[island_name]
+
+        shuffled_island_number = int.from_bytes(charts_mapping[offset * 2 : offset * 2 + 2], byteorder="big")
+        shuffled_island_name = ISLAND_NUMBER_TO_NAME[shuffled_island_number]
+        salvage_location_name = f"{shuffled_island_name} - Sunken Treasure"
+
+        salvage_locations_map[salvage_location_name] = salvage_bit
+    return salvage_locations_map
+
+
+def _kill_player() -> bool:
+    """
+    Set the player's current health to zero if they are in-game.
+
+    :return: Whether the player was in-game.
+    """
+    if not memory_backend.is_hooked() or not check_ingame():
+        return False
+    write_short(CURR_HEALTH_ADDR, 0)
+    return True
+
+
+async def _give_death(ctx: TWWContext) -> None:
     """
     Trigger the player's death in-game by setting their current health to zero.
 
     :param ctx: The Wind Waker client context.
     """
-    if (
-        ctx.slot is not None
-        and dolphin_memory_engine.is_hooked()
-        and ctx.dolphin_status == CONNECTION_CONNECTED_STATUS
-        and check_ingame()
-    ):
+    if ctx.slot is not None and ctx.dolphin_status == CONNECTION_CONNECTED_STATUS:
+        # Mark the death as received before the write, so the death is never sent back as the player's own.
         ctx.has_send_death = True
-        write_short(CURR_HEALTH_ADDR, 0)
+        if not await dolphin_io.run(_kill_player):
+            ctx.has_send_death = False
 
 
-def _give_item(ctx: TWWContext, item_name: str) -> bool:
+def _get_give_item_id(ctx: TWWContext, item_name: str) -> int:
     """
-    Give an item to the player in-game.
+    Get the ID to place in the give item array to give an item to the player.
 
     :param ctx: The Wind Waker client context.
     :param item_name: Name of the item to give.
-    :return: Whether the item was successfully given.
+    :return: The item ID to place in the give item array.
     """
-    if not check_ingame() or dolphin_memory_engine.read_byte(CURR_STAGE_ID_ADDR) == 0xFF:
-        return False
-
     item_id = ITEM_TABLE[item_name].item_id
 
-    # Loop through the item array, placing the item in an empty slot.
-    for idx in range(ctx.len_give_item_array):
-        slot = dolphin_memory_engine.read_byte(GIVE_ITEM_ARRAY_ADDR + idx)
-        if slot == 0xFF:
-            # Special case: Use a different item ID for the second progressive magic meter.
-            if item_name == "Progressive Magic Meter":
-                if ctx.received_magic:
-                    item_id = 0xB2
-                else:
-                    ctx.received_magic = True
-            dolphin_memory_engine.write_byte(GIVE_ITEM_ARRAY_ADDR + idx, item_id)
-            return True
+    # Special case: Use a different item ID for the second progressive magic meter.
+    if item_name == "Progressive Magic Meter":
+        if ctx.received_magic:
+            item_id = 0xB2
+        else:
+            ctx.received_magic = True
 
-    # If unable to place the item in the array, return `False`.
-    return False
+    return item_id
 
 
-async def give_items(ctx: TWWContext) -> None:
+def _read_expected_index() -> Optional[int]:
     """
-    Give the player all outstanding items they have yet to receive.
+    Read the expected index of the player, which is the index of the next item they should receive.
+
+    :return: The expected index, or `None` if the player cannot be given items right now.
+    """
+    if not check_ingame() or read_byte(CURR_STAGE_ID_ADDR) == 0xFF:
+        return None
+    return read_short(EXPECTED_INDEX_ADDR)
+
+
+def _write_given_items(first_slot: int, item_ids: bytes, expected_idx: int) -> None:
+    """
+    Write items to the give item array and increment the expected index past the last item given.
+
+    :param first_slot: The slot of the give item array at which to start writing.
+    :param item_ids: The IDs of the items to give.
+    :param expected_idx: The new expected index.
+    """
+    memory_backend.write_bytes(GIVE_ITEM_ARRAY_ADDR + first_slot, item_ids)
+    write_short(EXPECTED_INDEX_ADDR, expected_idx)
+
+
+async def give_items(ctx: TWWContext) -> bool:
+    """
+    Give the player outstanding items they have yet to receive.
+
+    The give item array is read once, and as many outstanding items as fit in its first run of empty slots are written
+    back with a single write. Only empty slots are overwritten, so items that the game has yet to process are left
+    untouched. The expected index is then updated once for the whole batch. Items that do not fit are given on a
+    following call.
 
     :param ctx: The Wind Waker client context.
+    :return: Whether the player has outstanding items.
     """
-    if check_ingame() and dolphin_memory_engine.read_byte(CURR_STAGE_ID_ADDR) != 0xFF:
-        # Read the expected index of the player, which is the index of the latest item they've received.
-        expected_idx = read_short(EXPECTED_INDEX_ADDR)
+    expected_idx = await dolphin_io.run(_read_expected_index)
+    if expected_idx is None:
+        return False
+
+    # Items at or after the player's expected index have yet to be given to the player.
+    ctx.latency_stats.forget_items_before(expected_idx)
+    if expected_idx >= len(ctx.received_items):
+        return False
+
+    give_item_array = bytearray(
+        await dolphin_io.run(memory_backend.read_bytes, GIVE_ITEM_ARRAY_ADDR, ctx.len_give_item_array)
+    )
+    if 0xFF not in give_item_array:
+        return True
+
+    # Fill the first run of empty slots with as many outstanding items as possible.
+    first_slot = give_item_array.index(0xFF)
+    end_slot = first_slot
+    while end_slot < len(give_item_array) and give_item_array[end_slot] == 0xFF:
+        end_slot += 1
+    pending_items = ctx.received_items.pending(expected_idx, end_slot - first_slot)
+    end_slot = first_slot + len(pending_items)
+    for slot, (_, item) in enumerate(pending_items, start=first_slot):
+        give_item_array[slot] = _get_give_item_id(ctx, LOOKUP_ID_TO_NAME[item.item])
+
+    write_start = time.perf_counter()
+    await dolphin_io.run(
+        _write_given_items, first_slot, bytes(give_item_array[first_slot:end_slot]), expected_idx + len(pending_items)
+    )
 
-        # Loop through items to give.
-        for item, idx in ctx.items_received_2:
-            # If the item's index is greater than the player's expected index, give the player the item.
-            if expected_idx <= idx:
-                # Attempt to give the item and increment the expected index.
-                while not _give_item(ctx, LOOKUP_ID_TO_NAME[item.item]):
-                    await asyncio.sleep(0.01)
+    given_time = time.perf_counter()
+    ctx.latency_stats.record("item_write", given_time - write_start)
+    for idx, _ in pending_items:
+        ctx.latency_stats.item_given(idx, given_time)
 
-                # Increment the expected index.
-                write_short(EXPECTED_INDEX_ADDR, idx + 1)
+    return True
 
 
-def check_special_location(location_name: str, data: TWWLocationData) -> bool:
+def get_special_location_addresses(location_name: str, data: TWWLocationData) -> tuple[int, ...]:
+    """
+    Get the addresses of the bytes that are read to check a location that requires special logic.
+
+    :param location_name: The name of the location.
+    :param data: The data associated with the location.
+    :raises NotImplementedError: If an unknown location name is provided.
+    :return: The addresses read by `check_special_location` for the location.
+    """
+    if location_name == "Windfall Island - Maggie - Delivery Reward":
+        return (*range(LETTER_OWND_ADDR, LETTER_OWND_ADDR + 4), *range(LETTER_BASE_ADDR, LETTER_BASE_ADDR + 8))
+    elif location_name == "Tingle Island - Ankle - Reward for All Tingle Statues":
+        return (TINGLE_STATUE_1_ADDR, TINGLE_STATUE_2_ADDR)
+    elif location_name in [
+        "Windfall Island - Lenzo's House - Become Lenzo's Assistant",
+        "Mailbox - Letter from Hoskit's Girlfriend",
+        "Mailbox - Letter from Baito's Mother",
+        "Mailbox - Letter from Grandma",
+    ]:
+        assert data.address is not None
+        return (data.address,)
+    else:
+        raise NotImplementedError(f"Unknown special location: {location_name}")
+
+
+def check_special_location(location_name: str, data: TWWLocationData, snapshot: MemorySnapshot) -> bool:
     """
     Check that the player has checked a given location.
     This function handles locations that require special logic.
 
     :param location_name: The name of the location.
     :param data: The data associated with the location.
+    :param snapshot: The snapshot of the memory used to check locations.
     :raises NotImplementedError: If an unknown location name is provided.
     """
     checked = False
@@ -408,39 +1221,36 @@ def check_special_location(location_name: str, data: TWWLocationData) -> bool:
     # 0x6 is delivered the final picture for Lenzo, 0x7 is a day has passed since becoming his assistant
     # Either is fine for sending the check, so check both conditions.
     if location_name == "Windfall Island - Lenzo's House - Become Lenzo's Assistant":
-        checked = (
-            dolphin_memory_engine.read_byte(data.address) & 0x6 == 0x6
-            or dolphin_memory_engine.read_byte(data.address) & 0x7 == 0x7
-        )
+        checked = snapshot.read_byte(data.address) & 0x6 == 0x6 or snapshot.read_byte(data.address) & 0x7 == 0x7
 
     # The "Windfall Island - Maggie - Delivery Reward" flag remains unknown.
     # However, as a temporary workaround, we can check if the player had Moblin's letter at some point, but it's no
     # longer in their Delivery Bag.
     elif location_name == "Windfall Island - Maggie - Delivery Reward":
-        was_moblins_owned = (dolphin_memory_engine.read_word(LETTER_OWND_ADDR) >> 15) & 1
-        dbag_contents = [dolphin_memory_engine.read_byte(LETTER_BASE_ADDR + offset) for offset in range(8)]
+        was_moblins_owned = (snapshot.read_word(LETTER_OWND_ADDR) >> 15) & 1
+        dbag_contents = snapshot.read_bytes(LETTER_BASE_ADDR, 8).tolist()
         checked = was_moblins_owned and 0x9B not in dbag_contents
 
     # For Letter from Hoskit's Girlfriend, we need to check two bytes.
     # 0x1 = Golden Feathers delivered, 0x2 = Mail sent by Hoskit's Girlfriend, 0x3 = Mail read by Link
     elif location_name == "Mailbox - Letter from Hoskit's Girlfriend":
-        checked = dolphin_memory_engine.read_byte(data.address) & 0x3 == 0x3
+        checked = snapshot.read_byte(data.address) & 0x3 == 0x3
 
     # For Letter from Baito's Mother, we need to check two bytes.
     # 0x1 = Note to Mom sent, 0x2 = Mail sent by Baito's Mother, 0x3 = Mail read by Link
     elif location_name == "Mailbox - Letter from Baito's Mother":
-        checked = dolphin_memory_engine.read_byte(data.address) & 0x3 == 0x3
+        checked = snapshot.read_byte(data.address) & 0x3 == 0x3
 
     # For Letter from Grandma, we need to check two bytes.
     # 0x1 = Grandma saved, 0x2 = Mail sent by Grandma, 0x3 = Mail read by Link
     elif location_name == "Mailbox - Letter from Grandma":
-        checked = dolphin_memory_engine.read_byte(data.address) & 0x3 == 0x3
+        checked = snapshot.read_byte(data.address) & 0x3 == 0x3
 
     # We check if the bits for turning all five statues are set for the Ankle's reward.
     # For some reason, the bit for the Dragon Tingle Statue is separate from the rest.
     elif location_name == "Tingle Island - Ankle - Reward for All Tingle Statues":
-        dragon_tingle_statue_rewarded = dolphin_memory_engine.read_byte(TINGLE_STATUE_1_ADDR) & 0x40 == 0x40
-        other_tingle_statues_rewarded = dolphin_memory_engine.read_byte(TINGLE_STATUE_2_ADDR) & 0x0F == 0x0F
+        dragon_tingle_statue_rewarded = snapshot.read_byte(TINGLE_STATUE_1_ADDR) & 0x40 == 0x40
+        other_tingle_statues_rewarded = snapshot.read_byte(TINGLE_STATUE_2_ADDR) & 0x0F == 0x0F
         checked = dragon_tingle_statue_rewarded and other_tingle_statues_rewarded
 
     else:
@@ -449,119 +1259,265 @@ def check_special_location(location_name: str, data: TWWLocationData) -> bool:
     return checked
 
 
-def check_regular_location(ctx: TWWContext, curr_stage_id: int, data: TWWLocationData) -> bool:
+def _get_bit_check(address: int, size: int, bit: int) -> tuple[int, int]:
     """
-    Check that the player has checked a given location.
-    This function handles locations that only require checking that a particular bit is set.
+    Get the byte and mask of a bit in a big-endian bitfield.
 
-    The check looks at the saved data for the stage at which the location is located and the data for the current stage.
-    In the latter case, this data includes data that has not yet been written to the saved data.
+    :param address: The address of the bitfield.
+    :param size: The size of the bitfield in bytes.
+    :param bit: The bit in the bitfield, counting from the least significant bit.
+    :return: A tuple of the address of the byte containing the bit and the mask of the bit within that byte.
+    """
+    return address + size - 1 - bit // 8, 1 << (bit % 8)
 
-    :param ctx: The Wind Waker client context.
-    :param curr_stage_id: The current stage at which the player is.
-    :param data: The data associated with the location.
-    :raises NotImplementedError: If a location with an unknown type is provided.
+
+# The checks of a single byte: the combined mask of all the checks, and the mask and location ID of each check.
+ByteChecks = tuple[int, tuple[tuple[int, Optional[int]], ...]]
+
+
+class LocationCheckPlan:
     """
-    checked = False
+    This class holds the compiled checks for the locations that the player has yet to check.
 
-    # Check the saved bitfields for the stage.
-    if data.type == TWWLocationType.CHEST:
-        checked = bool((ctx.chests_bitfields[data.stage_id] >> data.bit) & 1)
-    elif data.type == TWWLocationType.SWTCH:
-        checked = bool((ctx.switches_bitfields[data.stage_id] >> data.bit) & 1)
-    elif data.type == TWWLocationType.PCKUP:
-        checked = bool((ctx.pickups_bitfields[data.stage_id] >> data.bit) & 1)
-    else:
-        raise NotImplementedError(f"Unknown location type: {data.type}")
-
-    # If the location is in the current stage, check the bitfields for the current stage as well.
-    if not checked and curr_stage_id == data.stage_id:
-        if data.type == TWWLocationType.CHEST:
-            checked = bool((ctx.curr_stage_chests_bitfield >> data.bit) & 1)
-        elif data.type == TWWLocationType.SWTCH:
-            checked = bool((ctx.curr_stage_switches_bitfield >> data.bit) & 1)
-        elif data.type == TWWLocationType.PCKUP:
-            checked = bool((ctx.curr_stage_pickups_bitfield >> data.bit) & 1)
-        else:
-            raise NotImplementedError(f"Unknown location type: {data.type}")
+    Every location that only requires a single bit to be set is compiled into a byte address and bit mask. Checks are
+    grouped by byte, with the combined mask of each byte, so a byte with none of its relevant bits set is skipped with a
+    single comparison. The grouping also serves as a reverse index from the bits that changed in memory to the
+    locations they check. Locations are removed from the plan once they have been checked.
 
-    return checked
+    :param salvage_locations_map: The mapping of salvage locations to their sunken treasure bit.
+    """
+
+    def __init__(self, salvage_locations_map: dict[str, int]):
+        # The locations that require special logic, keyed by location ID, and the bytes each of them reads.
+        self.special_locations: dict[Optional[int], tuple[str, TWWLocationData]] = {}
+        self.special_location_addresses: dict[Optional[int], tuple[int, ...]] = {}
+
+        saved_checks: dict[int, list[tuple[int, Optional[int]]]] = {}
+        stage_checks: dict[int, dict[int, list[tuple[int, Optional[int]]]]] = {}
+        for location_name, data in LOCATION_TABLE.items():
+            # The goal location does not have a code, and is represented by `None`.
+            location_id = None if data.code is None else TWWLocation.get_apid(data.code)
+
+            if data.type == TWWLocationType.SPECL:
+                self.special_locations[location_id] = (location_name, data)
+                self.special_location_addresses[location_id] = get_special_location_addresses(location_name, data)
+                continue
+
+            if data.type == TWWLocationType.CHART:
+                assert location_name in salvage_locations_map, f'Location "{location_name}" salvage bit not set!'
+                address, mask = _get_bit_check(CHARTS_BITFLD_ADDR, 8, salvage_locations_map[location_name])
+            elif data.type == TWWLocationType.BOCTO:
+                assert data.address is not None
+                address, mask = _get_bit_check(data.address, 2, data.bit)
+            elif data.type == TWWLocationType.EVENT:
+                assert data.address is not None
+                address, mask = _get_bit_check(data.address, 1, data.bit)
+            else:
+                # Regular locations are checked against the saved bitfields for their stage, and against the bitfields
+                # for the current stage, which includes data that has not yet been written to the saved data.
+                if data.type == TWWLocationType.CHEST:
+                    saved_address, curr_stage_address, size = BASE_CHESTS_BITFLD_ADDR, CURR_STAGE_CHESTS_BITFLD_ADDR, 4
+                elif data.type == TWWLocationType.SWTCH:
+                    saved_address, curr_stage_address, size = (
+                        BASE_SWITCHES_BITFLD_ADDR,
+                        CURR_STAGE_SWITCHES_BITFLD_ADDR,
+                        10,
+                    )
+                elif data.type == TWWLocationType.PCKUP:
+                    saved_address, curr_stage_address, size = (
+                        BASE_PICKUPS_BITFLD_ADDR,
+                        CURR_STAGE_PICKUPS_BITFLD_ADDR,
+                        4,
+                    )
+                else:
+                    raise NotImplementedError(f"Unknown location type: {data.type}")
 
+                address, mask = _get_bit_check(saved_address + STAGE_INFO_SIZE * data.stage_id, size, data.bit)
+                curr_stage_byte, curr_stage_mask = _get_bit_check(curr_stage_address, size, data.bit)
+                stage_checks.setdefault(data.stage_id, {}).setdefault(curr_stage_byte, []).append(
+                    (curr_stage_mask, location_id)
+                )
 
-async def check_locations(ctx: TWWContext) -> None:
+            saved_checks.setdefault(address, []).append((mask, location_id))
+
+        # The checks against the saved data, keyed by the address of the byte they read.
+        self.byte_checks: dict[int, ByteChecks] = {
+            address: self._group_checks(checks) for address, checks in saved_checks.items()
+        }
+        # The checks against the data for the current stage, keyed by stage ID and then by byte address.
+        self.stage_byte_checks: dict[int, dict[int, ByteChecks]] = {
+            stage_id: {address: self._group_checks(checks) for address, checks in checks_by_address.items()}
+            for stage_id, checks_by_address in stage_checks.items()
+        }
+
+    @staticmethod
+    def _group_checks(
+        checks: Iterable[tuple[int, Optional[int]]],
+    ) -> ByteChecks:
+        """
+        Group the checks of a single byte with their combined mask.
+
+        :param checks: The mask and location ID of each check.
+        :return: A tuple of the combined mask and the checks.
+        """
+        checks = tuple(checks)
+        combined_mask = 0
+        for mask, _ in checks:
+            combined_mask |= mask
+        return combined_mask, checks
+
+    def discard(self, location_ids: Iterable[Optional[int]]) -> None:
+        """
+        Remove locations from the plan.
+
+        :param location_ids: The IDs of the locations to remove, where `None` represents the goal location.
+        """
+        location_ids = set(location_ids)
+        if not location_ids:
+            return
+
+        for byte_checks in [self.byte_checks, *self.stage_byte_checks.values()]:
+            for address, (_, checks) in list(byte_checks.items()):
+                if any(location_id in location_ids for _, location_id in checks):
+                    remaining = [check for check in checks if check[1] not in location_ids]
+                    if remaining:
+                        byte_checks[address] = self._group_checks(remaining)
+                    else:
+                        del byte_checks[address]
+        for location_id in location_ids:
+            self.special_locations.pop(location_id, None)
+            self.special_location_addresses.pop(location_id, None)
+
+    def evaluate(
+        self, snapshot: MemorySnapshot, curr_stage_id: int, previous: Optional[MemorySnapshot] = None
+    ) -> set[Optional[int]]:
+        """
+        Determine which locations in the plan the player has checked.
+
+        If a previous snapshot is given, only the bits that were set since then are evaluated, so the cost of each
+        evaluation is proportional to the changes in memory. The bitfields for the current stage are evaluated in full
+        whenever the current stage changes, as they are loaded from the saved data for the new stage.
+
+        :param snapshot: The snapshot of the memory used to check locations.
+        :param curr_stage_id: The current stage at which the player is.
+        :param previous: The snapshot from the previous evaluation, or `None` to evaluate every location in the plan.
+        :return: The IDs of the checked locations, where `None` represents the goal location.
+        """
+        stage_byte_checks = self.stage_byte_checks.get(curr_stage_id, {})
+        checked: set[Optional[int]] = set()
+
+        if previous is None:
+            for byte_checks in (self.byte_checks, stage_byte_checks):
+                for address in byte_checks:
+                    self._evaluate_byte(byte_checks, address, snapshot.read_byte(address), checked)
+            for location_id, (location_name, data) in self.special_locations.items():
+                if check_special_location(location_name, data, snapshot):
+                    checked.add(location_id)
+            return checked
+
+        changed = snapshot.diff(previous)
+        if not changed:
+            return checked
+
+        if previous.read_byte(CURR_STAGE_ID_ADDR) != curr_stage_id:
+            for address in stage_byte_checks:
+                self._evaluate_byte(stage_byte_checks, address, snapshot.read_byte(address), checked)
+            stage_byte_checks = {}
+
+        for address, changed_bits in changed.items():
+            # Only bits that were set since the previous snapshot can check a location.
+            set_bits = changed_bits & snapshot.read_byte(address)
+            if set_bits:
+                self._evaluate_byte(self.byte_checks, address, set_bits, checked)
+                self._evaluate_byte(stage_byte_checks, address, set_bits, checked)
+
+        for location_id, addresses in self.special_location_addresses.items():
+            if any(address in changed for address in addresses):
+                location_name, data = self.special_locations[location_id]
+                if check_special_location(location_name, data, snapshot):
+                    checked.add(location_id)
+
+        return checked
+
+    @staticmethod
+    def _evaluate_byte(
+        byte_checks: dict[int, ByteChecks], address: int, value: int, checked: set[Optional[int]]
+    ) -> None:
+        """
+        Add the locations whose bits are set in a byte to the set of checked locations.
+
+        :param byte_checks: The checks to evaluate, keyed by byte address.
+        :param address: The address of the byte.
+        :param value: The bits of the byte to evaluate.
+        :param checked: The set of checked locations to add to.
+        """
+        if address not in byte_checks:
+            return
+        combined_mask, checks = byte_checks[address]
+        value &= combined_mask
+        if value:
+            for mask, location_id in checks:
+                if value & mask:
+                    checked.add(location_id)
+
+
+async def check_locations(ctx: TWWContext) -> bool:
     """
-    Iterate through all locations and check whether the player has checked each location.
+    Check whether the player has checked each location that has yet to be checked.
 
     Update the server with all newly checked locations since the last update. If the player has completed the goal,
     notify the server.
 
     :param ctx: The Wind Waker client context.
+    :return: Whether the memory used to check locations changed since the previous check.
     """
-    # Read the bitfield for sunken treasure locations.
-    ctx.charts_bitfield = int.from_bytes(dolphin_memory_engine.read_bytes(CHARTS_BITFLD_ADDR, 8), byteorder="big")
-
-    # Read the bitfields once before the loop to speed things up a bit.
-    ctx.chests_bitfields = {}
-    ctx.switches_bitfields = {}
-    ctx.pickups_bitfields = {}
-    for stage_id in range(0xE):
-        chest_bitfield_addr = BASE_CHESTS_BITFLD_ADDR + (0x24 * stage_id)
-        switches_bitfield_addr = BASE_SWITCHES_BITFLD_ADDR + (0x24 * stage_id)
-        pickups_bitfield_addr = BASE_PICKUPS_BITFLD_ADDR + (0x24 * stage_id)
-
-        ctx.chests_bitfields[stage_id] = int(dolphin_memory_engine.read_word(chest_bitfield_addr))
-        ctx.switches_bitfields[stage_id] = int.from_bytes(
-            dolphin_memory_engine.read_bytes(switches_bitfield_addr, 10), byteorder="big"
-        )
-        ctx.pickups_bitfields[stage_id] = int(dolphin_memory_engine.read_word(pickups_bitfield_addr))
-
-    ctx.curr_stage_chests_bitfield = int(dolphin_memory_engine.read_word(CURR_STAGE_CHESTS_BITFLD_ADDR))
-    ctx.curr_stage_switches_bitfield = int.from_bytes(
-        dolphin_memory_engine.read_bytes(CURR_STAGE_SWITCHES_BITFLD_ADDR, 10), byteorder="big"
-    )
-    ctx.curr_stage_pickups_bitfield = int(dolphin_memory_engine.read_word(CURR_STAGE_PICKUPS_BITFLD_ADDR))
+    # Read all the memory needed to check locations at once.
+    read_start = time.perf_counter()
+    snapshot = await dolphin_io.run(MemorySnapshot.read, LOCATION_MEMORY_RANGES)
+    read_end = time.perf_counter()
+    ctx.latency_stats.record("memory_read", read_end - read_start)
 
     # We check which locations are currently checked on the current stage.
-    curr_stage_id = dolphin_memory_engine.read_byte(CURR_STAGE_ID_ADDR)
-
-    # Loop through all locations to see if each has been checked.
-    for location, data in LOCATION_TABLE.items():
-        checked = False
-        if data.type == TWWLocationType.CHART:
-            assert location in ctx.salvage_locations_map, f'Location "{location}" salvage bit not set!'
-            salvage_bit = ctx.salvage_locations_map[location]
-            checked = bool((ctx.charts_bitfield >> salvage_bit) & 1)
-        elif data.type == TWWLocationType.BOCTO:
-            assert data.address is not None
-            checked = bool((read_short(data.address) >> data.bit) & 1)
-        elif data.type == TWWLocationType.EVENT:
-            checked = bool((dolphin_memory_engine.read_byte(data.address) >> data.bit) & 1)
-        elif data.type == TWWLocationType.SPECL:
-            checked = check_special_location(location, data)
+    curr_stage_id = snapshot.read_byte(CURR_STAGE_ID_ADDR)
+
+    # Only the locations that have yet to be checked are evaluated, and only against the bits that changed since the
+    # previous snapshot. A new check plan is evaluated in full.
+    if ctx.check_plan is None:
+        ctx.salvage_locations_map = await dolphin_io.run(read_salvage_locations_map)
+        ctx.build_check_plan()
+        ctx.location_snapshot = None
+    assert ctx.check_plan is not None
+    previous_snapshot = ctx.location_snapshot
+    newly_checked = ctx.check_plan.evaluate(snapshot, curr_stage_id, previous_snapshot)
+    ctx.check_plan.discard(newly_checked)
+    ctx.location_snapshot = snapshot
+    ctx.latency_stats.record("check_evaluation", time.perf_counter() - read_end)
+    memory_changed = previous_snapshot is None or snapshot.buffers != previous_snapshot.buffers
+
+    for location_id in newly_checked:
+        if location_id is None:
+            if not ctx.finished_game:
+                ctx.queue_msgs([{"cmd": "StatusUpdate", "status": ClientStatus.CLIENT_GOAL}])
+                ctx.finished_game = True
         else:
-            checked = check_regular_location(ctx, curr_stage_id, data)
+            ctx.locations_checked.add(location_id)
 
-        if checked:
-            if data.code is None:
-                if not ctx.finished_game:
-                    await ctx.send_msgs([{"cmd": "StatusUpdate", "status": ClientStatus.CLIENT_GOAL}])
-                    ctx.finished_game = True
-            else:
-                ctx.locations_checked.add(TWWLocation.get_apid(data.code))
-
-    # Send the list of newly-checked locations to the server.
+    # Queue the newly-checked locations to be sent to the server, along with any that the server has yet to
+    # acknowledge. Those already in flight are left out when the queue is flushed.
     locations_checked = ctx.locations_checked.difference(ctx.checked_locations)
     if locations_checked:
-        await ctx.send_msgs([{"cmd": "LocationChecks", "locations": locations_checked}])
+        ctx.queue_msgs([{"cmd": "LocationChecks", "locations": locations_checked}])
+        if ctx.location_checks_read_time is None and any(location_id is not None for location_id in newly_checked):
+            ctx.location_checks_read_time = read_start
+
+    return memory_changed
 
 
-async def check_current_stage_changed(ctx: TWWContext) -> None:
+def read_current_stage_name() -> str:
     """
-    Check if the player has moved to a new stage.
-    If so, update all trackers with the new stage name.
-    If the stage has never been visited, additionally update the server.
+    Read the name of the stage at which the player currently is.
 
-    :param ctx: The Wind Waker client context.
+    :return: The name of the current stage.
     """
     new_stage_name = read_string(CURR_STAGE_NAME_ADDR, 8)
 
@@ -569,10 +1525,23 @@ async def check_current_stage_changed(ctx: TWWContext) -> None:
     # rather than a unique stage.
     if (
         new_stage_name == "sea"
-        and dolphin_memory_engine.read_byte(MOST_RECENT_ROOM_NUMBER_ADDR) == CLIFF_PLATEAU_ISLES_ROOM_NUMBER
+        and read_byte(MOST_RECENT_ROOM_NUMBER_ADDR) == CLIFF_PLATEAU_ISLES_ROOM_NUMBER
         and read_short(MOST_RECENT_SPAWN_ID_ADDR) == CLIFF_PLATEAU_ISLES_HIGHEST_ISLE_SPAWN_ID
     ):
         new_stage_name = CLIFF_PLATEAU_ISLES_HIGHEST_ISLE_DUMMY_STAGE_NAME
+    return new_stage_name
+
+
+async def check_current_stage_changed(ctx: TWWContext) -> bool:
+    """
+    Check if the player has moved to a new stage.
+    If so, update all trackers with the new stage name.
+    If the stage has never been visited, additionally update the server.
+
+    :param ctx: The Wind Waker client context.
+    :return: Whether the player has moved to a new stage.
+    """
+    new_stage_name = await dolphin_io.run(read_current_stage_name)
 
     current_stage_name = ctx.current_stage_name
     if new_stage_name != current_stage_name:
@@ -584,14 +1553,16 @@ async def check_current_stage_changed(ctx: TWWContext) -> None:
             "slots": [ctx.slot],
             "data": data_to_send,
         }
-        await ctx.send_msgs([message])
+        ctx.queue_msgs([message])
 
         # If the stage has never been visited before, update the server's data storage to indicate that it has been
         # visited.
         visited_stage_names = ctx.visited_stage_names
         if visited_stage_names is not None and new_stage_name not in visited_stage_names:
             visited_stage_names.add(new_stage_name)
-            await ctx.update_visited_stages(new_stage_name)
+            ctx.update_visited_stages(new_stage_name)
+        return True
+    return False
 
 
 async def check_alive() -> bool:
@@ -600,7 +1571,7 @@ async def check_alive() -> bool:
 
     :return: `True` if the player is alive, otherwise `False`.
     """
-    cur_health = read_short(CURR_HEALTH_ADDR)
+    cur_health = await dolphin_io.run(read_short, CURR_HEALTH_ADDR)
     return cur_health > 0
 
 
@@ -611,8 +1582,8 @@ async def check_death(ctx: TWWContext) -> None:
 
     :return: `True` if the player is dead, otherwise `False`.
     """
-    if ctx.slot is not None and check_ingame():
-        cur_health = read_short(CURR_HEALTH_ADDR)
+    if ctx.slot is not None and await dolphin_io.run(check_ingame):
+        cur_health = await dolphin_io.run(read_short, CURR_HEALTH_ADDR)
         if cur_health <= 0:
             if not ctx.has_send_death and time.time() >= ctx.last_death_link + 3:
                 ctx.has_send_death = True
@@ -639,55 +1610,65 @@ async def dolphin_sync_task(ctx: TWWContext) -> None:
     :param ctx: The Wind Waker client context.
     """
     logger.info("Starting Dolphin connector. Use /dolphin for status information.")
+    scheduler = ctx.poll_scheduler
     while not ctx.exit_event.is_set():
         try:
-            if dolphin_memory_engine.is_hooked() and ctx.dolphin_status == CONNECTION_CONNECTED_STATUS:
-                if not check_ingame():
+            if ctx.dolphin_status == CONNECTION_CONNECTED_STATUS and await dolphin_io.run(memory_backend.is_hooked):
+                if not await dolphin_io.run(check_ingame):
                     # Reset the give item array while not in the game.
-                    dolphin_memory_engine.write_bytes(GIVE_ITEM_ARRAY_ADDR, bytes([0xFF] * ctx.len_give_item_array))
-                    await asyncio.sleep(0.1)
+                    await dolphin_io.run(
+                        memory_backend.write_bytes, GIVE_ITEM_ARRAY_ADDR, bytes([0xFF] * ctx.len_give_item_array)
+                    )
+                    await asyncio.sleep(scheduler.next_poll_interval())
                     continue
                 if ctx.slot is not None:
                     if "DeathLink" in ctx.tags:
                         await check_death(ctx)
-                    await give_items(ctx)
-                    await check_locations(ctx)
-                    await check_current_stage_changed(ctx)
+                    items_pending = await give_items(ctx)
+                    memory_changed = await check_locations(ctx)
+                    stage_changed = await check_current_stage_changed(ctx)
+                    # Send everything produced during this iteration to the server at once.
+                    await ctx.flush_msgs()
+                    await asyncio.sleep(scheduler.next_poll_interval(memory_changed or stage_changed, items_pending))
                 else:
                     if not ctx.auth:
-                        ctx.auth = read_string(SLOT_NAME_ADDR, 0x40)
+                        ctx.auth = await dolphin_io.run(read_string, SLOT_NAME_ADDR, 0x40)
                     if ctx.awaiting_rom:
                         await ctx.server_auth()
-                await asyncio.sleep(0.1)
+                    await asyncio.sleep(DEFAULT_POLL_INTERVAL)
             else:
                 if ctx.dolphin_status == CONNECTION_CONNECTED_STATUS:
                     logger.info("Connection to Dolphin lost, reconnecting...")
                     ctx.dolphin_status = CONNECTION_LOST_STATUS
                 logger.info("Attempting to connect to Dolphin...")
-                dolphin_memory_engine.hook()
-                if dolphin_memory_engine.is_hooked():
-                    if dolphin_memory_engine.read_bytes(0x80000000, 6) != b"GZLE99":
+                await dolphin_io.run(memory_backend.hook)
+                if await dolphin_io.run(memory_backend.is_hooked):
+                    if await dolphin_io.run(memory_backend.read_bytes, 0x80000000, 6) != b"GZLE99":
                         logger.info(CONNECTION_REFUSED_GAME_STATUS)
                         ctx.dolphin_status = CONNECTION_REFUSED_GAME_STATUS
-                        dolphin_memory_engine.un_hook()
-                        await asyncio.sleep(5)
+                        await dolphin_io.run(memory_backend.un_hook)
+                        await asyncio.sleep(scheduler.next_reconnect_delay())
                     else:
                         logger.info(CONNECTION_CONNECTED_STATUS)
                         ctx.dolphin_status = CONNECTION_CONNECTED_STATUS
                         ctx.locations_checked = set()
+                        ctx.check_plan = None
+                        scheduler.reset_reconnect_delay()
                 else:
-                    logger.info("Connection to Dolphin failed, attempting again in 5 seconds...")
+                    delay = scheduler.next_reconnect_delay()
+                    logger.info(f"Connection to Dolphin failed, attempting again in {delay:.1f} seconds...")
                     ctx.dolphin_status = CONNECTION_LOST_STATUS
                     await ctx.disconnect()
-                    await asyncio.sleep(5)
+                    await asyncio.sleep(delay)
                     continue
         except Exception:
-            dolphin_memory_engine.un_hook()
-            logger.info("Connection to Dolphin failed, attempting again in 5 seconds...")
+            await dolphin_io.run(memory_backend.un_hook)
+            delay = scheduler.next_reconnect_delay()
+            logger.info(f"Connection to Dolphin failed, attempting again in {delay:.1f} seconds...")
             logger.error(traceback.format_exc())
             ctx.dolphin_status = CONNECTION_LOST_STATUS
             await ctx.disconnect()
-            await asyncio.sleep(5)
+            await asyncio.sleep(delay)
             continue
 
 
@@ -719,6 +1700,8 @@ def main(connect: Optional[str] = None, password: Optional[str] = None) -> None:
             await asyncio.sleep(3)
             await ctx.dolphin_sync_task
 
+        dolphin_io.shutdown()
+
     import colorama
 
     colorama.init()
@@ -8,29 +8,24 @@ import yaml
 
 from BaseClasses import Item
 from BaseClasses import ItemClassification as IC
-from BaseClasses import MultiWorld, Region, Tutorial
+from BaseClasses import CollectionState, MultiWorld, Region, Tutorial
 from Options import Toggle
 from worlds.AutoWorld import WebWorld, World
 from worlds.generic.Rules import add_item_rule
 from worlds.LauncherComponents import Component, SuffixIdentifier, Type, components, launch_subprocess
 
-from . import Macros
 from .Items import ISLAND_NUMBER_TO_CHART_NAME, ITEM_TABLE, TWWItem, item_name_groups
-from .Locations import LOCATION_TABLE, TWWFlag, TWWLocation
+from .Locations import LOCATION_TABLE, TWWFlag, TWWLocation, get_progress_and_nonprogress_locations
+from .Logic import LogicCompiler, LogicGates
 from .Options import TWWOptions, tww_option_groups
 from .randomizers.Charts import ISLAND_NUMBER_TO_NAME, ChartRandomizer
 from .randomizers.Dungeons import Dungeon, create_dungeons
 from .randomizers.Entrances import (
     ALL_ENTRANCES,
     ALL_EXITS,
-    BOSS_ENTRANCES,
     BOSS_EXIT_TO_DUNGEON,
-    DUNGEON_ENTRANCES,
-    FAIRY_FOUNTAIN_ENTRANCES,
-    MINIBOSS_ENTRANCES,
+    ENTRANCE_CONNECTIONS,
     MINIBOSS_EXIT_TO_DUNGEON,
-    SECRET_CAVE_ENTRANCES,
-    SECRET_CAVE_INNER_ENTRANCES,
     EntranceRandomizer,
 )
 from .randomizers.ItemPool import generate_itempool
@@ -121,13 +116,19 @@ class TWWWorld(World):
         self.dungeon_local_item_names: set[str] = set()
         self.dungeon_specific_item_names: set[str] = set()
         self.dungeons: dict[str, Dungeon] = {}
+        self.pre_fill_items: list[Item] = []
 
         self.useful_pool: list[str] = []
         self.filler_pool: list[str] = []
 
+        # The classification of every item in this world, keyed by item name. This depends on the world's options.
+        self.item_classifications: dict[str, IC] = {}
+
         self.charts = ChartRandomizer(self)
         self.entrances = EntranceRandomizer(self)
         self.boss_reqs = RequiredBossesRandomizer(self)
+        self.logic_gates: LogicGates
+        self.logic_compiler = LogicCompiler(self)
 
     def _determine_progress_and_nonprogress_locations(self) -> tuple[set[str], set[str]]:
         """
@@ -137,12 +138,13 @@ class TWWWorld(World):
         the names of the nonprogress locations.
         """
 
-        def add_flag(option: Toggle, flag: TWWFlag) -> TWWFlag:
-            return flag if option else TWWFlag.ALWAYS
+        def add_flag(option: Toggle, flag: TWWFlag) -> int:
+            return flag.value if option else 0
 
         options = self.options
 
-        enabled_flags = TWWFlag.ALWAYS
+        # The flags are combined as integers, which is much faster than combining `TWWFlag` values.
+        enabled_flags = TWWFlag.ALWAYS.value
         enabled_flags |= add_flag(options.progression_dungeons, TWWFlag.DUNGEON | TWWFlag.BOSS)
         enabled_flags |= add_flag(options.progression_tingle_chests, TWWFlag.TNGL_CT)
         enabled_flags |= add_flag(options.progression_dungeon_secrets, TWWFlag.DG_SCRT)
@@ -165,16 +167,12 @@ class TWWWorld(World):
         enabled_flags |= add_flag(options.progression_island_puzzles, TWWFlag.ISLND_P)
         enabled_flags |= add_flag(options.progression_misc, TWWFlag.MISCELL)
 
-        progress_locations: set[str] = set()
-        nonprogress_locations: set[str] = set()
-        for location, data in LOCATION_TABLE.items():
-            if data.flags & enabled_flags == data.flags:
-                progress_locations.add(location)
-            else:
-                nonprogress_locations.add(location)
+        # The split is shared between worlds with the same progression options. Copy it, since the world modifies its
+        # sets of locations later in generation.
+        progress_locations, nonprogress_locations = get_progress_and_nonprogress_locations(enabled_flags)
         assert progress_locations.isdisjoint(nonprogress_locations)
 
-        return progress_locations, nonprogress_locations
+        return set(progress_locations), set(nonprogress_locations)
 
     def generate_early(self) -> None:
         """
@@ -196,6 +194,13 @@ class TWWWorld(World):
                 else:
                     self.options.local_items.value |= self.dungeon_local_item_names
 
+        # Resolve the logic's option checks once, and fold them into the compiled rules.
+        self.logic_gates = LogicGates.from_options(options)
+        self.logic_compiler.specialize(self.logic_gates)
+
+        # Classify the items once, so that creating an item is a lookup.
+        self.update_item_classifications()
+
     create_dungeons = create_dungeons
 
     def setup_base_regions(self) -> None:
@@ -203,45 +208,28 @@ class TWWWorld(World):
         Create and connect all the necessary regions in the multiworld and establish the access rules for entrances.
         """
 
-        def get_access_rule(region: str) -> str:
-            snake_case_region = region.lower().replace("'", "").replace(" ", "_")
-            return f"can_access_{snake_case_region}"
-
         multiworld = self.multiworld
         player = self.player
 
         # "The Great Sea" region contains all locations that are not in a randomizable region.
         great_sea_region = Region("The Great Sea", player, multiworld)
-        multiworld.regions.append(great_sea_region)
+        regions: dict[str, Region] = {great_sea_region.name: great_sea_region}
 
         # Add all randomizable regions.
         for _entrance in ALL_ENTRANCES:
-            multiworld.regions.append(Region(_entrance.entrance_name, player, multiworld))
+            regions[_entrance.entrance_name] = Region(_entrance.entrance_name, player, multiworld)
         for _exit in ALL_EXITS:
-            multiworld.regions.append(Region(_exit.unique_name, player, multiworld))
-
-        # Connect the dungeon, secret caves, and fairy fountain regions to the "The Great Sea" region.
-        for entrance in DUNGEON_ENTRANCES + SECRET_CAVE_ENTRANCES + FAIRY_FOUNTAIN_ENTRANCES:
-            great_sea_region.connect(
-                self.get_region(entrance.entrance_name),
-                rule=lambda state, entrance=entrance.entrance_name: getattr(Macros, get_access_rule(entrance))(
-                    state, player
-                ),
-            )
-
-        # Connect nested regions with their parent region.
-        for entrance in MINIBOSS_ENTRANCES + BOSS_ENTRANCES + SECRET_CAVE_INNER_ENTRANCES:
-            parent_region_name = entrance.entrance_name.split(" in ")[-1]
-            # Consider Hyrule Castle and Forsaken Fortress as part of The Great Sea (regions are not randomizable).
-            if parent_region_name in ["Hyrule Castle", "Forsaken Fortress"]:
-                parent_region_name = "The Great Sea"
-            parent_region = self.get_region(parent_region_name)
-            parent_region.connect(
-                self.get_region(entrance.entrance_name),
-                rule=lambda state, entrance=entrance.entrance_name: getattr(Macros, get_access_rule(entrance))(
-                    state, player
-                ),
-            )
+            regions[_exit.unique_name] = Region(_exit.unique_name, player, multiworld)
+        multiworld.regions.extend(regions.values())
+
+        # Connect each entrance region to its parent region: the dungeon, secret caves, and fairy fountain regions to
+        # "The Great Sea" region, and nested regions to the region they are nested in.
+        for connection in ENTRANCE_CONNECTIONS.values():
+            # Prefer the compiled version of the access rule, falling back to the macro itself.
+            rule = self.logic_compiler.macro_rule(connection.access_rule_name)
+            if rule is None:
+                rule = lambda state, access_rule=connection.access_rule: access_rule(state, player)
+            regions[connection.parent_region_name].connect(regions[connection.entrance_name], rule=rule)
 
     def create_regions(self) -> None:
         """
@@ -439,6 +427,32 @@ class TWWWorld(World):
                     chart_name = self.charts.island_number_to_chart_name[island_number]
                     hint_data[self.player][location.address] = chart_name
 
+    def collect(self, state: CollectionState, item: Item) -> bool:
+        """
+        Collect an item into the collection state, discarding the cached rule results that depend on it.
+
+        :param state: The collection state.
+        :param item: The item to collect.
+        :return: Whether the state changed.
+        """
+        change = super().collect(state, item)
+        if change:
+            self.logic_compiler.invalidate(state, item.name)
+        return change
+
+    def remove(self, state: CollectionState, item: Item) -> bool:
+        """
+        Remove an item from the collection state, discarding the cached rule results that depend on it.
+
+        :param state: The collection state.
+        :param item: The item to remove.
+        :return: Whether the state changed.
+        """
+        change = super().remove(state, item)
+        if change:
+            self.logic_compiler.invalidate(state, item.name)
+        return change
+
     def determine_item_classification(self, name: str) -> IC | None:
         """
         Determine the adjusted classification of an item. The classification of an item may be affected by which options
@@ -478,6 +492,19 @@ class TWWWorld(World):
 
         return adjusted_classification
 
+    def update_item_classifications(self) -> None:
+        """
+        Classify every item in this world based on the player's options.
+
+        This must be called again if the options that affect item classifications change.
+        """
+        self.item_classifications = {}
+        for name, data in ITEM_TABLE.items():
+            adjusted_classification = self.determine_item_classification(name)
+            self.item_classifications[name] = (
+                data.classification if adjusted_classification is None else adjusted_classification
+            )
+
     def create_item(self, name: str) -> TWWItem:
         """
         Create an item for this world type and player.
@@ -485,9 +512,13 @@ class TWWWorld(World):
         :param name: The name of the item to create.
         :raises KeyError: If an invalid item name is provided.
         """
-        if name in ITEM_TABLE:
-            return TWWItem(name, self.player, ITEM_TABLE[name], self.determine_item_classification(name))
-        raise KeyError(f"Invalid item name: {name}")
+        if not self.item_classifications:
+            # Items may be created before `generate_early` has run (e.g., by tests).
+            self.update_item_classifications()
+        classification = self.item_classifications.get(name)
+        if classification is None:
+            raise KeyError(f"Invalid item name: {name}")
+        return TWWItem(name, self.player, ITEM_TABLE[name], classification)
 
     def get_filler_item_name(self) -> str:
         """
@@ -515,13 +546,9 @@ class TWWWorld(World):
 
         :return: A list of pre-fill items.
         """
-        res = []
-        if self.dungeon_local_item_names:
-            for dungeon in self.dungeons.values():
-                for item in dungeon.all_items:
-                    if item.name in self.dungeon_local_item_names:
-                        res.append(item)
-        return res
+        # These are determined once the dungeons are created, and the core calls this every time it builds an
+        # `all_state`.
+        return self.pre_fill_items
 
     def fill_slot_data(self) -> Mapping[str, Any]:
         """
@@ -0,0 +1,311 @@
+"""
+Benchmark The Wind Waker client against an in-process stand-in for Dolphin.
+
+The benchmark drives the client from a real Archipelago checkout in which this world is installed, but replaces
+Dolphin with a bytearray-backed emulation of the console memory used by the client, and the server with a local
+stand-in that acknowledges every location check. A scripted playthrough sets location bits at a configurable rate
+while the client gives the player a backlog of received items. The results are reported as JSON.
+
+Example:
+    python benchmarks/client.py --archipelago ~/Archipelago --duration 10 --checks-per-second 20 --items 500
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from types import ModuleType
+from typing import Any, Optional
+
+GAME_NAME = "The Wind Waker"
+
+
+class FakeDolphinMemory:
+    """
+    This class emulates the parts of the GameCube's memory that The Wind Waker client uses.
+
+    The memory starts out as a save file loaded on the sea stage. Every emulated frame, the game drains the give item
+    array, recording each item it gives to the player.
+
+    :param client: The client module.
+    :param slot_name: The slot name stored in memory.
+    """
+
+    BASE_ADDRESS = 0x80000000
+    SIZE = 0x01800000
+
+    def __init__(self, client: ModuleType, slot_name: str):
+        self.client = client
+        self.memory = bytearray(self.SIZE)
+        self.hooked = False
+        self.reads = 0
+        self.writes = 0
+        # The item IDs given to the player, with the time they were given.
+        self.given_items: list[tuple[int, float]] = []
+
+        self.poke(self.BASE_ADDRESS, b"GZLE99")
+        self.poke(client.CURR_STAGE_NAME_ADDR, b"sea".ljust(8, b"\0"))
+        self.poke(client.CURR_STAGE_ID_ADDR, bytes([0]))
+        self.poke(client.CURR_HEALTH_ADDR, (12).to_bytes(2, byteorder="big"))
+        self.poke(client.GIVE_ITEM_ARRAY_ADDR, bytes([0xFF] * 0x10))
+        self.poke(client.SLOT_NAME_ADDR, slot_name.encode().ljust(0x40, b"\0"))
+        # The charts are not randomized, so each chart leads to its original island.
+        for offset in range(49):
+            self.poke(client.CHARTS_MAPPING_ADDR + offset * 2, (offset + 1).to_bytes(2, byteorder="big"))
+
+    def poke(self, console_address: int, data: bytes) -> None:
+        """
+        Write bytes to memory as the game, without counting it as a client write.
+
+        :param console_address: Address to start writing to.
+        :param data: The bytes to write.
+        """
+        offset = console_address - self.BASE_ADDRESS
+        self.memory[offset : offset + len(data)] = data
+
+    def hook(self) -> None:
+        self.hooked = True
+
+    def un_hook(self) -> None:
+        self.hooked = False
+
+    def is_hooked(self) -> bool:
+        return self.hooked
+
+    def read_bytes(self, console_address: int, size: int) -> bytes:
+        self.reads += 1
+        offset = console_address - self.BASE_ADDRESS
+        return bytes(self.memory[offset : offset + size])
+
+    def write_bytes(self, console_address: int, data: bytes) -> None:
+        self.writes += 1
+        self.poke(console_address, data)
+
+    def advance_frame(self) -> None:
+        """
+        Emulate a frame of the game, which gives the player every item in the give item array and then clears it.
+        """
+        offset = self.client.GIVE_ITEM_ARRAY_ADDR - self.BASE_ADDRESS
+        now = time.perf_counter()
+        for index in range(offset, offset + 0x10):
+            if self.memory[index] != 0xFF:
+                self.given_items.append((self.memory[index], now))
+                self.memory[index] = 0xFF
+
+
+class ScriptedPlaythrough:
+    """
+    This class checks locations in a random order by setting their bits in memory at a constant rate.
+
+    :param memory: The emulated memory.
+    :param client: The client module.
+    :param salvage_locations_map: The mapping of salvage locations to their sunken treasure bit.
+    :param checks_per_second: The number of locations to check per second.
+    :param rng: The random number generator that determines the order of the checks.
+    """
+
+    def __init__(
+        self,
+        memory: FakeDolphinMemory,
+        client: ModuleType,
+        salvage_locations_map: dict[str, int],
+        checks_per_second: float,
+        rng: random.Random,
+    ):
+        self.memory = memory
+        self.checks_per_second = checks_per_second
+
+        # Check locations through their saved bitfields, which do not depend on the current stage.
+        plan = client.LocationCheckPlan(salvage_locations_map)
+        self.remaining_checks = [
+            (address, mask, location_id)
+            for address, (_, checks) in plan.byte_checks.items()
+            for mask, location_id in checks
+            if location_id is not None
+        ]
+        rng.shuffle(self.remaining_checks)
+
+        # The time at which each location was checked, keyed by location ID.
+        self.checked_at: dict[int, float] = {}
+        self.start_time: Optional[float] = None
+
+    def step(self) -> None:
+        """
+        Check every location that is due since the start of the playthrough.
+        """
+        now = time.perf_counter()
+        if self.start_time is None:
+            self.start_time = now
+        due = int((now - self.start_time) * self.checks_per_second) - len(self.checked_at)
+        for _ in range(min(due, len(self.remaining_checks))):
+            address, mask, location_id = self.remaining_checks.pop()
+            offset = address - self.memory.BASE_ADDRESS
+            self.memory.memory[offset] |= mask
+            self.checked_at[location_id] = now
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    """
+    Summarize a list of durations.
+
+    :param values: The durations, in seconds.
+    :return: The count, mean, median, 95th percentile, and maximum of the durations, in milliseconds.
+    """
+    if not values:
+        return {"count": 0}
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "mean_ms": statistics.fmean(values) * 1000,
+        "p50_ms": values[len(values) // 2] * 1000,
+        "p95_ms": values[min(len(values) - 1, int(len(values) * 0.95))] * 1000,
+        "max_ms": values[-1] * 1000,
+    }
+
+
+async def run_benchmark(
+    client: ModuleType, duration: float, checks_per_second: float, num_items: int, seed: int
+) -> dict[str, Any]:
+    """
+    Run the client against the emulated memory and a local stand-in for the server.
+
+    :param client: The client module.
+    :param duration: How long to run the client, in seconds.
+    :param checks_per_second: The number of locations the scripted playthrough checks per second.
+    :param num_items: The number of items the player has received from the server when the benchmark starts.
+    :param seed: The seed for the scripted playthrough and the received items.
+    :return: The measurements.
+    """
+    from NetUtils import NetworkItem
+
+    rng = random.Random(seed)
+    memory = FakeDolphinMemory(client, "Player1")
+    client.set_memory_backend(memory)
+    memory.hook()
+
+    sent_at: dict[int, float] = {}
+
+    class BenchmarkContext(client.TWWContext):
+        """
+        The client context, with a local stand-in for the server that acknowledges every location check.
+        """
+
+        async def send_msgs(self, msgs: list[Any]) -> None:
+            now = time.perf_counter()
+            for msg in msgs:
+                if msg["cmd"] == "LocationChecks":
+                    new_locations = set(msg["locations"]) - self.checked_locations
+                    for location_id in new_locations:
+                        sent_at.setdefault(location_id, now)
+                    self.checked_locations |= new_locations
+                    self.on_package("RoomUpdate", {"checked_locations": list(new_locations)})
+
+    ctx = BenchmarkContext(None, None)
+    ctx.slot = 1
+    ctx.auth = "Player1"
+    ctx.dolphin_status = client.CONNECTION_CONNECTED_STATUS
+    # Build the check plan, reading the salvage locations map through the Dolphin I/O thread, as the sync loop does
+    # the first time it checks locations.
+    await client.check_locations(ctx)
+
+    item_ids = sorted(client.LOOKUP_ID_TO_NAME)
+    received_items = [NetworkItem(rng.choice(item_ids), -1, 1, 0) for _ in range(num_items)]
+    ctx.on_package("ReceivedItems", {"index": 0, "items": received_items})
+    items_received_at = time.perf_counter()
+
+    playthrough = ScriptedPlaythrough(memory, client, ctx.salvage_locations_map, checks_per_second, rng)
+
+    ticks = 0
+    tick_durations: list[float] = []
+    start_time = time.perf_counter()
+    while time.perf_counter() - start_time < duration:
+        playthrough.step()
+        memory.advance_frame()
+        tick_start = time.perf_counter()
+        await client.give_items(ctx)
+        await client.check_locations(ctx)
+        await client.check_current_stage_changed(ctx)
+        await ctx.flush_msgs()
+        tick_durations.append(time.perf_counter() - tick_start)
+        ticks += 1
+        # Yield to the event loop, as the sync loop would while sleeping.
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start_time
+
+    delivery_time = memory.given_items[-1][1] - items_received_at if memory.given_items else None
+    check_latencies = [
+        sent_at[location_id] - checked_at
+        for location_id, checked_at in playthrough.checked_at.items()
+        if location_id in sent_at
+    ]
+    return {
+        "duration_s": elapsed,
+        "ticks": ticks,
+        "ticks_per_second": ticks / elapsed,
+        "tick": _percentiles(tick_durations),
+        "memory_reads_per_tick": memory.reads / ticks,
+        "memory_writes_per_tick": memory.writes / ticks,
+        "items_received": num_items,
+        "items_given": len(memory.given_items),
+        "items_given_per_second": len(memory.given_items) / delivery_time if delivery_time else None,
+        "locations_checked": len(playthrough.checked_at),
+        "locations_sent": len(sent_at),
+        "check_send_latency": _percentiles(check_latencies),
+        "client_latency_stats": ctx.latency_stats.summary(),
+    }
+
+
+def load_client(archipelago_path: str) -> ModuleType:
+    """
+    Import The Wind Waker client from an Archipelago checkout.
+
+    :param archipelago_path: The path to the Archipelago checkout.
+    :return: The client module.
+    """
+    if archipelago_path not in sys.path:
+        sys.path.insert(0, archipelago_path)
+    os.chdir(archipelago_path)
+
+    from worlds import AutoWorld
+
+    world_type = AutoWorld.AutoWorldRegister.world_types[GAME_NAME]
+    return importlib.import_module(f"{world_type.__module__}.TWWClient")
+
+
+def main() -> None:
+    """
+    Run the client benchmark from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark The Wind Waker client against an emulated Dolphin.")
+    parser.add_argument(
+        "--archipelago",
+        default=os.environ.get("ARCHIPELAGO_PATH"),
+        help="Path to the Archipelago checkout (defaults to the ARCHIPELAGO_PATH environment variable).",
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="How long to run the client, in seconds.")
+    parser.add_argument("--checks-per-second", type=float, default=10.0)
+    parser.add_argument("--items", type=int, default=500, help="Number of received items to give the player.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the JSON report to this file instead of standard output.")
+    args = parser.parse_args()
+
+    if not args.archipelago:
+        parser.error("the path to an Archipelago checkout is required")
+
+    client = load_client(os.path.abspath(args.archipelago))
+    report = asyncio.run(run_benchmark(client, args.duration, args.checks_per_second, args.items, args.seed))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
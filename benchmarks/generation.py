@@ -0,0 +1,497 @@
+"""
+Benchmark the generation of The Wind Waker slots across a matrix of option presets.
+
+The benchmark drives a real Archipelago checkout in which this world is installed (e.g., as `worlds/tww` or as an
+apworld in `custom_worlds`). Each seed is generated in its own worker process so that peak memory usage is measured per
+seed. The results are reported as JSON.
+
+Example:
+    python benchmarks/generation.py --archipelago ~/Archipelago --seeds 4 --players 40 --output results.json
+
+The item pool is built in the `create_items` stage, and the time spent creating individual items in any stage is
+reported as `create_item`. When dungeon items are placed in `pre_fill`, the time spent building the dungeon fill's base
+state is compared against building it from the whole item pool, and the difference is reported.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from argparse import Namespace
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from multiprocessing import Pool
+from typing import Any, NamedTuple, Optional
+
+GAME_NAME = "The Wind Waker"
+
+# Option overrides for each benchmarked preset. Options that are not overridden keep their default value.
+PRESETS: dict[str, dict[str, Any]] = {
+    "default": {},
+    "dungeon_er": {
+        "randomize_dungeon_entrances": True,
+    },
+    "mixed_pools": {
+        "randomize_dungeon_entrances": True,
+        "randomize_secret_cave_entrances": True,
+        "randomize_miniboss_entrances": True,
+        "randomize_boss_entrances": True,
+        "randomize_secret_cave_inner_entrances": True,
+        "randomize_fairy_fountain_entrances": True,
+        "mix_entrances": "mix_pools",
+    },
+    "required_bosses": {
+        "required_bosses": True,
+    },
+    "keylunacy": {
+        "randomize_smallkeys": "keylunacy",
+        "randomize_bigkeys": "keylunacy",
+        "randomize_mapcompass": "keylunacy",
+    },
+    "swordless": {
+        "sword_mode": "swordless",
+    },
+}
+
+# The generation steps run before the fill, in the order the Archipelago core runs them.
+DEFAULT_GENERATION_STEPS: tuple[str, ...] = (
+    "generate_early",
+    "create_regions",
+    "create_items",
+    "set_rules",
+    "generate_basic",
+    "pre_fill",
+)
+
+# Stages that are timed inside other stages or are not part of generation, so they are left out of the total.
+NESTED_STAGES: tuple[str, ...] = (
+    "fill_dungeons_restrictive",
+    "dungeon_fill_base_state",
+    "full_itempool_base_state",
+    "create_item",
+)
+
+
+class BenchmarkJob(NamedTuple):
+    """
+    This class represents the generation of a single seed.
+
+    :param archipelago_path: The path to the Archipelago checkout.
+    :param preset: The name of the option preset.
+    :param seed: The seed to generate.
+    :param players: The number of The Wind Waker slots in the multiworld.
+    :param output: Whether to run `generate_output` for each slot.
+    :param rule_cache: Whether the logic caches rule results on the collection state.
+    :param plando_game: If set, a slot of this game is added to the multiworld, and a progression item of the first
+        The Wind Waker slot is placed in one of its locations before `pre_fill`. The dungeon fill's base state is then
+        checked against the one built from the whole item pool.
+    """
+
+    archipelago_path: str
+    preset: str
+    seed: int
+    players: int
+    output: bool
+    rule_cache: bool = True
+    plando_game: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        """
+        The name the seed is summarized under, which tells apart the seeds generated without the rule cache or with an
+        item placed in another game.
+        """
+        label = self.preset if self.rule_cache else f"{self.preset} (no rule cache)"
+        return label if self.plando_game is None else f"{label} (plando into {self.plando_game})"
+
+
+class Timer:
+    """
+    This class accumulates the wall-clock time spent in named stages.
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, float] = defaultdict(float)
+
+    def measure(self, stage: str, function: Callable[..., Any], *args: Any) -> Any:
+        """
+        Call a function and add its duration to a stage.
+
+        :param stage: The name of the stage.
+        :param function: The function to call.
+        :return: The function's return value.
+        """
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.stages[stage] += time.perf_counter() - start
+
+    def wrap(self, stage: str, function: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap a function so that its duration is added to a stage every time it is called.
+
+        :param stage: The name of the stage.
+        :param function: The function to wrap.
+        :return: The wrapped function.
+        """
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.stages[stage] += time.perf_counter() - start
+
+        return timed
+
+
+def _count_rule_evaluations(multiworld: Any, players: Iterable[int]) -> dict[str, int]:
+    """
+    Wrap the access rules of the players' locations and entrances so that their evaluations are counted.
+
+    :param multiworld: The MultiWorld instance.
+    :param players: The players whose rules are counted.
+    :return: The evaluation counts, updated in place as rules are evaluated.
+    """
+    counts = {"locations": 0, "entrances": 0}
+
+    def counted(kind: str, rule: Callable[[Any], bool]) -> Callable[[Any], bool]:
+        def counted_rule(state: Any) -> bool:
+            counts[kind] += 1
+            return rule(state)
+
+        return counted_rule
+
+    for player in players:
+        for region in multiworld.get_regions(player):
+            for location in region.locations:
+                location.access_rule = counted("locations", location.access_rule)
+            for entrance in region.exits:
+                entrance.access_rule = counted("entrances", entrance.access_rule)
+    return counts
+
+
+def _build_full_itempool_state(multiworld: Any) -> Any:
+    """
+    Build a state from the item pool of every game in the multiworld, as the dungeon fill's base state used to be built.
+
+    This is only timed, as a reference for how much time the dungeon fill's base state saves.
+
+    :param multiworld: The MultiWorld instance.
+    :return: The swept state.
+    """
+    from BaseClasses import CollectionState
+
+    state = CollectionState(multiworld)
+    for item in multiworld.itempool:
+        multiworld.worlds[item.player].collect(state, item)
+    state.sweep_for_advancements()
+    return state
+
+
+def _build_reference_dungeon_fill_base_state(multiworld: Any, in_dungeon_items: list[Any]) -> Any:
+    """
+    Build the dungeon fill's base state from the item pool of every game in the multiworld, sweeping every location.
+
+    :param multiworld: The MultiWorld instance.
+    :param in_dungeon_items: The dungeon items that are about to be placed.
+    :return: The base state.
+    """
+    from BaseClasses import CollectionState
+
+    state = CollectionState(multiworld)
+    for item in multiworld.itempool:
+        multiworld.worlds[item.player].collect(state, item)
+    in_dungeon_player_ids = {item.player for item in in_dungeon_items}
+    pre_fill_items = []
+    for player in in_dungeon_player_ids:
+        pre_fill_items += multiworld.worlds[player].get_pre_fill_items()
+    for item in in_dungeon_items:
+        if item in pre_fill_items:
+            pre_fill_items.remove(item)
+    for item in pre_fill_items:
+        multiworld.worlds[item.player].collect(state, item)
+    state.sweep_for_advancements()
+    for player in in_dungeon_player_ids:
+        if state.has("Victory", player):
+            state.remove(multiworld.worlds[player].create_item("Victory"))
+    return state
+
+
+def _verified(get_base_state: Callable[..., Any], verified: dict[str, bool]) -> Callable[..., Any]:
+    """
+    Wrap the function that builds the dungeon fill's base state, so that every state it builds is checked against the
+    state built from the item pool of every game.
+
+    :param get_base_state: The function to wrap.
+    :param verified: Updated in place with `"dungeon_fill_base_state": True` once a state has been checked.
+    :return: The wrapped function.
+    """
+
+    def verified_get_base_state(multiworld: Any, in_dungeon_items: list[Any]) -> Any:
+        state = get_base_state(multiworld, in_dungeon_items)
+        reference = _build_reference_dungeon_fill_base_state(multiworld, in_dungeon_items)
+        for player in multiworld.get_game_players(GAME_NAME):
+            state.update_reachable_regions(player)
+            reference.update_reachable_regions(player)
+            if state.prog_items[player] != reference.prog_items[player]:
+                raise AssertionError(f"The dungeon fill's base state has different items for player {player}.")
+            if state.reachable_regions[player] != reference.reachable_regions[player]:
+                raise AssertionError(f"The dungeon fill's base state reaches different regions for player {player}.")
+        verified["dungeon_fill_base_state"] = True
+        return state
+
+    return verified_get_base_state
+
+
+def _place_item_in_other_game(multiworld: Any, other_player: int) -> None:
+    """
+    Place a progression item of the first The Wind Waker slot in a location of another game's slot, as plando would.
+
+    :param multiworld: The MultiWorld instance.
+    :param other_player: The slot of the other game.
+    :raises RuntimeError: If there is no item or location to use.
+    """
+    item = next(
+        (item for item in multiworld.itempool if item.player == 1 and item.advancement and item.code is not None), None
+    )
+    location = next(
+        (location for location in multiworld.get_unfilled_locations(other_player) if location.address is not None),
+        None,
+    )
+    if item is None or location is None:
+        raise RuntimeError("Could not find a progression item and a location in the other game to place it in.")
+    multiworld.itempool.remove(item)
+    location.place_locked_item(item)
+
+
+def run_job(job: BenchmarkJob) -> dict[str, Any]:
+    """
+    Generate a single seed and measure it.
+
+    :param job: The seed to generate.
+    :return: The measurements for the seed.
+    """
+    if job.archipelago_path not in sys.path:
+        sys.path.insert(0, job.archipelago_path)
+    os.chdir(job.archipelago_path)
+
+    from BaseClasses import CollectionState, MultiWorld
+    from Fill import balance_multiworld_progression, distribute_items_restrictive
+    from worlds import AutoWorld
+
+    world_type = AutoWorld.AutoWorldRegister.world_types[GAME_NAME]
+    dungeons_module = importlib.import_module(f"{world_type.__module__}.randomizers.Dungeons")
+    logic_module = importlib.import_module(f"{world_type.__module__}.Logic")
+    logic_module.LogicCompiler.cache_rule_results = job.rule_cache
+    generation_steps = tuple(
+        step for step in getattr(AutoWorld, "gen_steps", DEFAULT_GENERATION_STEPS) if step != "generate_output"
+    )
+
+    timer = Timer()
+    dungeons_module.fill_dungeons_restrictive = timer.wrap(
+        "fill_dungeons_restrictive", dungeons_module.fill_dungeons_restrictive
+    )
+    dungeons_module.get_dungeon_fill_base_state = timer.wrap(
+        "dungeon_fill_base_state", dungeons_module.get_dungeon_fill_base_state
+    )
+    verified: dict[str, bool] = {}
+    if job.plando_game is not None:
+        dungeons_module.get_dungeon_fill_base_state = _verified(dungeons_module.get_dungeon_fill_base_state, verified)
+    # Every item is created through `create_item`, both for the item pool and for the core's `all_state`.
+    world_type.create_item = timer.wrap("create_item", world_type.create_item)
+
+    players = range(1, job.players + 1)
+    overrides = PRESETS[job.preset]
+    other_player = job.players + 1
+    multiworld = MultiWorld(job.players if job.plando_game is None else other_player)
+    multiworld.game = {player: GAME_NAME for player in players}
+    if job.plando_game is not None:
+        multiworld.game[other_player] = job.plando_game
+    multiworld.player_name = {player: f"Player{player}" for player in multiworld.game}
+    multiworld.set_seed(job.seed)
+    args = Namespace()
+    for player, game in multiworld.game.items():
+        game_overrides = overrides if game == GAME_NAME else {}
+        for name, option in AutoWorld.AutoWorldRegister.world_types[game].options_dataclass.type_hints.items():
+            # Each player needs their own option instances, since worlds may modify their options during generation.
+            value = game_overrides.get(name, option.default)
+            vars(args).setdefault(name, {})[player] = option.from_any(value)
+    multiworld.set_options(args)
+    multiworld.state = CollectionState(multiworld)
+
+    rule_evaluations: dict[str, int] = {}
+    for step in generation_steps:
+        if step == "pre_fill" and job.plando_game is not None:
+            _place_item_in_other_game(multiworld, other_player)
+        timer.measure(step, AutoWorld.call_all, multiworld, step)
+        if step == "set_rules":
+            rule_evaluations = _count_rule_evaluations(multiworld, players)
+        elif step == "pre_fill" and "dungeon_fill_base_state" in timer.stages:
+            timer.measure("full_itempool_base_state", _build_full_itempool_state, multiworld)
+
+    timer.measure("fill", distribute_items_restrictive, multiworld)
+    timer.measure("post_fill", AutoWorld.call_all, multiworld, "post_fill")
+    timer.measure("balancing", balance_multiworld_progression, multiworld)
+    beatable = multiworld.can_beat_game(CollectionState(multiworld))
+
+    if job.output:
+        with tempfile.TemporaryDirectory() as output_directory:
+            timer.measure("generate_output", AutoWorld.call_all, multiworld, "generate_output", output_directory)
+
+    return {
+        "preset": job.label,
+        "rule_cache": job.rule_cache,
+        "dungeon_fill_base_state_verified": verified.get("dungeon_fill_base_state", False),
+        "seed": job.seed,
+        "players": job.players,
+        "beatable": beatable,
+        "stages": dict(timer.stages),
+        "total": sum(duration for stage, duration in timer.stages.items() if stage not in NESTED_STAGES),
+        "dungeon_fill_base_state_saved_s": (
+            timer.stages["full_itempool_base_state"] - timer.stages["dungeon_fill_base_state"]
+            if "dungeon_fill_base_state" in timer.stages
+            else None
+        ),
+        # On Linux, `ru_maxrss` is reported in kilobytes.
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "rule_evaluations": rule_evaluations,
+    }
+
+
+def summarize(results: list[dict[str, Any]]) -> dict[str, dict[str, dict[str, float]]]:
+    """
+    Summarize the per-seed measurements for each preset.
+
+    :param results: The per-seed measurements.
+    :return: The mean, minimum, and maximum of every stage, the total, and the peak RSS for each preset.
+    """
+    samples: dict[str, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
+    for result in results:
+        preset_samples = samples[result["preset"]]
+        for stage, duration in result["stages"].items():
+            preset_samples[stage].append(duration)
+        preset_samples["total"].append(result["total"])
+        preset_samples["peak_rss_kb"].append(result["peak_rss_kb"])
+
+    return {
+        preset: {
+            metric: {"mean": statistics.fmean(values), "min": min(values), "max": max(values)}
+            for metric, values in preset_samples.items()
+        }
+        for preset, preset_samples in samples.items()
+    }
+
+
+def compare_rule_cache(results: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Compare the seeds of the default preset generated with and without the logic's rule cache.
+
+    :param results: The per-seed measurements.
+    :return: The mean total time and rule evaluations with and without the cache, and the speedup of the cache.
+    """
+    comparison: dict[str, Any] = {}
+    for name, label in (("cached", "default"), ("uncached", "default (no rule cache)")):
+        default_results = [result for result in results if result["preset"] == label]
+        if not default_results:
+            continue
+        comparison[name] = {
+            "total_mean_s": statistics.fmean(result["total"] for result in default_results),
+            "location_rule_evaluations_mean": statistics.fmean(
+                result["rule_evaluations"].get("locations", 0) for result in default_results
+            ),
+            "entrance_rule_evaluations_mean": statistics.fmean(
+                result["rule_evaluations"].get("entrances", 0) for result in default_results
+            ),
+        }
+    if "cached" in comparison and "uncached" in comparison:
+        comparison["speedup"] = comparison["uncached"]["total_mean_s"] / comparison["cached"]["total_mean_s"]
+    return comparison
+
+
+def main() -> None:
+    """
+    Run the generation benchmark from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the generation of The Wind Waker slots.")
+    parser.add_argument(
+        "--archipelago",
+        default=os.environ.get("ARCHIPELAGO_PATH"),
+        help="Path to the Archipelago checkout (defaults to the ARCHIPELAGO_PATH environment variable).",
+    )
+    parser.add_argument("--presets", nargs="+", choices=sorted(PRESETS), default=list(PRESETS))
+    parser.add_argument("--seeds", type=int, default=3, help="Number of seeds to generate per preset.")
+    parser.add_argument("--players", type=int, default=1, help="Number of The Wind Waker slots per seed.")
+    parser.add_argument("--first-seed", type=int, default=1)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--output-files", action="store_true", help="Also time `generate_output`.")
+    parser.add_argument(
+        "--compare-rule-cache",
+        action="store_true",
+        help="Also generate the default preset with the logic's rule cache disabled, and compare the two.",
+    )
+    parser.add_argument(
+        "--verify-dungeon-fill-state",
+        metavar="GAME",
+        nargs="?",
+        const="Clique",
+        help="Also generate the default preset with a slot of another game (Clique by default) that holds a "
+        "plando'd item of the first slot, and check the dungeon fill's base state against the one built from the "
+        "whole item pool.",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file instead of standard output.")
+    args = parser.parse_args()
+
+    if not args.archipelago:
+        parser.error("the path to an Archipelago checkout is required")
+
+    jobs = [
+        BenchmarkJob(os.path.abspath(args.archipelago), preset, seed, args.players, args.output_files)
+        for preset in args.presets
+        for seed in range(args.first_seed, args.first_seed + args.seeds)
+    ]
+    if args.compare_rule_cache:
+        # The default preset uses the default options, as in the `The Wind Waker.yaml` template.
+        rule_cache_settings = (False,) if "default" in args.presets else (True, False)
+        jobs += [
+            BenchmarkJob(
+                os.path.abspath(args.archipelago), "default", seed, args.players, args.output_files, rule_cache
+            )
+            for rule_cache in rule_cache_settings
+            for seed in range(args.first_seed, args.first_seed + args.seeds)
+        ]
+    if args.verify_dungeon_fill_state:
+        jobs += [
+            BenchmarkJob(
+                os.path.abspath(args.archipelago),
+                "default",
+                seed,
+                args.players,
+                args.output_files,
+                plando_game=args.verify_dungeon_fill_state,
+            )
+            for seed in range(args.first_seed, args.first_seed + args.seeds)
+        ]
+    # Use a fresh process for every seed so that the peak RSS of one seed does not carry over to the next.
+    with Pool(args.processes, maxtasksperchild=1) as pool:
+        results = pool.map(run_job, jobs, chunksize=1)
+
+    report = {"players": args.players, "results": results, "summary": summarize(results)}
+    if args.compare_rule_cache:
+        report["rule_cache_comparison"] = compare_rule_cache(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -30,27 +30,14 @@ class Dungeon:
     ):
         self.name = name
         self.big_key = big_key
-        self.small_keys = small_keys
-        self.dungeon_items = dungeon_items
+        self.small_keys: tuple[Item, ...] = tuple(small_keys)
+        self.dungeon_items: tuple[Item, ...] = tuple(dungeon_items)
         self.player = player
 
-    @property
-    def keys(self) -> list[Item]:
-        """
-        Retrieve all the keys for the dungeon.
-
-        :return: A list of Small Keys and the Big Key (if it exists).
-        """
-        return self.small_keys + ([self.big_key] if self.big_key else [])
-
-    @property
-    def all_items(self) -> list[Item]:
-        """
-        Retrieve all items associated with the dungeon.
-
-        :return: A list of all items associated with the dungeon.
-        """
-        return self.dungeon_items + self.keys
+        # A dungeon's items never change once it is created, so they are combined here instead of on every access.
+        # The keys are the Small Keys and the Big Key (if it exists).
+        self.keys: tuple[Item, ...] = self.small_keys + ((big_key,) if big_key else ())
+        self.all_items: tuple[Item, ...] = self.dungeon_items + self.keys
 
     def __eq__(self, other: Any) -> bool:
         """
@@ -144,6 +131,14 @@ def create_dungeons(world: "TWWWorld") -> None:
                 item_factory(["WT Dungeon Map", "WT Compass"], world),
             )
 
+    # The dungeon items that are collected when the core creates an `all_state`, since they are not in the item pool.
+    world.pre_fill_items = [
+        item
+        for dungeon in world.dungeons.values()
+        for item in dungeon.all_items
+        if item.name in world.dungeon_local_item_names
+    ]
+
 
 def get_dungeon_item_pool(multiworld: MultiWorld) -> list[Item]:
     """
@@ -205,6 +200,69 @@ def modify_dungeon_location_rules(locations: list[Location], dungeon_specific: s
             )
 
 
+def get_dungeon_fill_base_state(multiworld: MultiWorld, in_dungeon_items: list[Item]) -> CollectionState:
+    """
+    Construct a partial `all_state` to place The Wind Waker dungeon items with. It contains the item pool and the items
+    from `get_pre_fill_items` that aren't in a dungeon, without the completion condition.
+
+    Dungeon items are only placed in The Wind Waker locations, and whether those are reachable depends only on the
+    items of The Wind Waker players and of the item link groups they belong to. So, only their items are collected and
+    only their locations are swept, instead of collecting the item pool of every game in the multiworld.
+
+    The exception is when one of their advancement items was already placed in another player's location (e.g., by
+    plando). Whether that item is reachable depends on the other player's items, so the item pool of every game is
+    collected and every location is swept in that case.
+
+    :param multiworld: The MultiWorld instance.
+    :param in_dungeon_items: The dungeon items that are about to be placed.
+    :return: The base state for placing the dungeon items.
+    """
+    tww_players = {world.player for world in multiworld.get_game_worlds("The Wind Waker")}
+    players = tww_players | {
+        group_id for group_id, group in multiworld.groups.items() if not tww_players.isdisjoint(group["players"])
+    }
+    if any(
+        location.item.player in players and location.item.advancement
+        for location in multiworld.get_filled_locations()
+        if location.player not in players
+    ):
+        players = set(multiworld.player_ids) | set(multiworld.groups)
+
+    all_state_base = CollectionState(multiworld)
+    for item in multiworld.itempool:
+        if item.player in players:
+            multiworld.worlds[item.player].collect(all_state_base, item)
+
+    in_dungeon_player_ids = {item.player for item in in_dungeon_items}
+    pre_fill_items = []
+    for player in in_dungeon_player_ids:
+        pre_fill_items += multiworld.worlds[player].get_pre_fill_items()
+    for item in in_dungeon_items:
+        try:
+            pre_fill_items.remove(item)
+        except ValueError:
+            # `pre_fill_items` should be a subset of `in_dungeon_items`, but just in case.
+            pass
+    for item in pre_fill_items:
+        multiworld.worlds[item.player].collect(all_state_base, item)
+    all_state_base.sweep_for_advancements(
+        [location for player in players for location in multiworld.get_filled_locations(player)]
+    )
+
+    # The fill still sweeps the other players' locations, which are unreachable in this state. Resolve their regions
+    # once here, so that every copy of this state doesn't have to.
+    for player in multiworld.player_ids:
+        if player not in players:
+            all_state_base.update_reachable_regions(player)
+
+    # Remove the completion condition so that minimal-accessibility words place keys correctly.
+    for player in in_dungeon_player_ids:
+        if all_state_base.has("Victory", player):
+            all_state_base.remove(multiworld.worlds[player].create_item("Victory"))
+
+    return all_state_base
+
+
 def fill_dungeons_restrictive(multiworld: MultiWorld) -> None:
     """
     Correctly fill The Wind Waker dungeons in the multiworld.
@@ -236,29 +294,7 @@ def fill_dungeons_restrictive(multiworld: MultiWorld) -> None:
                 reverse=True,
             )
 
-            # Construct a partial `all_state` that contains only the items from `get_pre_fill_items` that aren't in a
-            # dungeon.
-            in_dungeon_player_ids = {item.player for item in in_dungeon_items}
-            all_state_base = CollectionState(multiworld)
-            for item in multiworld.itempool:
-                multiworld.worlds[item.player].collect(all_state_base, item)
-            pre_fill_items = []
-            for player in in_dungeon_player_ids:
-                pre_fill_items += multiworld.worlds[player].get_pre_fill_items()
-            for item in in_dungeon_items:
-                try:
-                    pre_fill_items.remove(item)
-                except ValueError:
-                    # `pre_fill_items` should be a subset of `in_dungeon_items`, but just in case.
-                    pass
-            for item in pre_fill_items:
-                multiworld.worlds[item.player].collect(all_state_base, item)
-            all_state_base.sweep_for_advancements()
-
-            # Remove the completion condition so that minimal-accessibility words place keys correctly.
-            for player in (item.player for item in in_dungeon_items):
-                if all_state_base.has("Victory", player):
-                    all_state_base.remove(multiworld.worlds[player].create_item("Victory"))
+            all_state_base = get_dungeon_fill_base_state(multiworld, in_dungeon_items)
 
             fill_restrictive(
                 multiworld,
@@ -1,13 +1,17 @@
+import logging
 from collections import defaultdict
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Mapping
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, ClassVar, Optional
+from random import Random
+from types import MappingProxyType
+from typing import TYPE_CHECKING, ClassVar, NamedTuple, Optional
 
+from BaseClasses import CollectionState
 from Fill import FillError
 from Options import OptionError
 
 from .. import Macros
-from ..Locations import LOCATION_TABLE, TWWFlag, split_location_name_by_zone
+from ..Locations import LOCATION_COLUMNS, TWWFlag
 
 if TYPE_CHECKING:
     from .. import TWWWorld
@@ -208,6 +212,8 @@ ALL_EXITS: list[ZoneExit] = (
     + SECRET_CAVE_INNER_EXITS
     + FAIRY_FOUNTAIN_EXITS
 )
+DUNGEON_AND_BOSS_EXITS: frozenset[ZoneExit] = frozenset(DUNGEON_EXITS + BOSS_EXITS)
+MINIBOSS_AND_BOSS_EXITS: frozenset[ZoneExit] = frozenset(MINIBOSS_EXITS + BOSS_EXITS)
 
 ENTRANCE_RANDOMIZABLE_ITEM_LOCATION_TYPES: list[TWWFlag] = [
     TWWFlag.DUNGEON,
@@ -216,6 +222,8 @@ ENTRANCE_RANDOMIZABLE_ITEM_LOCATION_TYPES: list[TWWFlag] = [
     TWWFlag.SAVAGE,
     TWWFlag.GRT_FRY,
 ]
+# The flags of the item location types above, combined into an integer bitmask.
+ENTRANCE_RANDOMIZABLE_ITEM_LOCATION_FLAGS: int = sum(flag.value for flag in ENTRANCE_RANDOMIZABLE_ITEM_LOCATION_TYPES)
 ITEM_LOCATION_NAME_TO_EXIT_OVERRIDES: dict[str, ZoneExit] = {
   "Forbidden Woods - Mothula Miniboss Room":           ZoneExit.all["Forbidden Woods Miniboss Arena"],
   "Tower of the Gods - Darknut Miniboss Room":         ZoneExit.all["Tower of the Gods Miniboss Arena"],
@@ -255,6 +263,184 @@ BOSS_EXIT_TO_DUNGEON: dict[str, str] = {
 }
 
 
+def _group_exits_by_zone_name() -> dict[str, list[ZoneExit]]:
+    """
+    Group the zone exits by the name of the zone they lead into.
+
+    :return: The zone exits that lead into each zone, keyed by zone name.
+    """
+    zone_name_to_exits: dict[str, list[ZoneExit]] = defaultdict(list)
+    for zone_exit in ZoneExit.all.values():
+        if zone_exit.zone_name is not None:
+            zone_name_to_exits[zone_exit.zone_name].append(zone_exit)
+    return dict(zone_name_to_exits)
+
+
+ZONE_NAME_TO_EXITS: dict[str, list[ZoneExit]] = _group_exits_by_zone_name()
+
+
+def is_item_location_behind_randomizable_entrance(location_name: str) -> bool:
+    """
+    Determine if the location is behind a randomizable entrance.
+
+    :param location_name: The location to check.
+    :return: `True` if the location is behind a randomizable entrance, `False` otherwise.
+    """
+    loc_zone_name = LOCATION_COLUMNS.zone_of(location_name)
+    if loc_zone_name in ["Ganon's Tower", "Mailbox"]:
+        # Ganon's Tower and the handful of Mailbox locations that depend on beating dungeon bosses are considered
+        # "Dungeon" location types by the logic, but the entrance randomizer does not need to consider them.
+        # Although the mail locations are technically locked behind dungeons, we can still ignore them here because
+        # if all of the locations in the dungeon itself are nonprogress, then any mail depending on that dungeon
+        # should also be enforced as nonprogress by other parts of the code.
+        return False
+
+    types = LOCATION_COLUMNS.flags_of(location_name)
+    is_boss = bool(types & TWWFlag.BOSS.value)
+    if loc_zone_name == "Forsaken Fortress" and not is_boss:
+        # Special case. FF is a dungeon that is not randomized, except for the boss arena.
+        return False
+
+    is_big_octo = bool(types & TWWFlag.BG_OCTO.value)
+    if is_big_octo:
+        # The Big Octo Great Fairy is the only Great Fairy location that is not also a Fairy Fountain.
+        return False
+
+    # In the general case, we check if the location has a type corresponding to exits that can be randomized.
+    if types & ENTRANCE_RANDOMIZABLE_ITEM_LOCATION_FLAGS:
+        return True
+
+    return False
+
+
+def get_zone_exit_for_item_location(location_name: str) -> Optional[ZoneExit]:
+    """
+    Retrieve the zone exit for a given location.
+
+    :param location_name: The name of the location.
+    :raises Exception: If a location exit override should be used instead.
+    :return: The zone exit for the location or `None` if the location is not behind a randomizable entrance.
+    """
+    if not is_item_location_behind_randomizable_entrance(location_name):
+        return None
+
+    zone_exit = ITEM_LOCATION_NAME_TO_EXIT_OVERRIDES.get(location_name, None)
+    if zone_exit is not None:
+        return zone_exit
+
+    loc_zone_name = LOCATION_COLUMNS.zone_of(location_name)
+    possible_exits = ZONE_NAME_TO_EXITS.get(loc_zone_name, [])
+    if len(possible_exits) == 0:
+        return None
+    elif len(possible_exits) == 1:
+        return possible_exits[0]
+    else:
+        raise Exception(
+            f"Multiple zone exits share the same zone name: {loc_zone_name!r}. "
+            "Use a location exit override instead."
+        )
+
+
+def _map_item_locations_to_zone_exits() -> tuple[Mapping[str, ZoneExit], Mapping[ZoneExit, tuple[str, ...]]]:
+    """
+    Map item locations to their corresponding zone exits.
+
+    :return: A tuple of two read-only mappings, the first from each item location behind a randomizable entrance to the
+    zone exit containing it, and the second from each zone exit to the item locations that logically depend on it.
+    """
+    item_location_to_containing_zone_exit: dict[str, ZoneExit] = {}
+    zone_exit_to_logically_dependent_item_locations: dict[ZoneExit, list[str]] = defaultdict(list)
+
+    # Only locations with an entrance-randomizable type can be behind a randomizable entrance.
+    for loc_name in LOCATION_COLUMNS.with_any_flag(ENTRANCE_RANDOMIZABLE_ITEM_LOCATION_FLAGS):
+        zone_exit = get_zone_exit_for_item_location(loc_name)
+        if zone_exit is not None:
+            item_location_to_containing_zone_exit[loc_name] = zone_exit
+            zone_exit_to_logically_dependent_item_locations[zone_exit].append(loc_name)
+
+    # This location isn't inside a zone exit, but it does logically require the player to be able to reach a different
+    # item location inside one.
+    loc_name = "The Great Sea - Withered Trees"
+    for sub_loc_name in ["Cliff Plateau Isles - Highest Isle"]:
+        sub_zone_exit = item_location_to_containing_zone_exit.get(sub_loc_name)
+        if sub_zone_exit is not None:
+            zone_exit_to_logically_dependent_item_locations[sub_zone_exit].append(loc_name)
+
+    return MappingProxyType(item_location_to_containing_zone_exit), MappingProxyType(
+        {zone_exit: tuple(locs) for zone_exit, locs in zone_exit_to_logically_dependent_item_locations.items()}
+    )
+
+
+# The mappings between item locations and zone exits only depend on static data, so they are computed once and shared
+# by all worlds.
+ITEM_LOCATION_TO_CONTAINING_ZONE_EXIT, ZONE_EXIT_TO_LOGICALLY_DEPENDENT_ITEM_LOCATIONS = (
+    _map_item_locations_to_zone_exits()
+)
+
+
+def get_access_rule_name(region_name: str) -> str:
+    """
+    Get the name of the macro that determines access to a randomizable region.
+
+    :param region_name: The name of the region.
+    :return: The name of the region's access macro.
+    """
+    snake_case_region = region_name.lower().replace("'", "").replace(" ", "_")
+    return f"can_access_{snake_case_region}"
+
+
+class EntranceConnection(NamedTuple):
+    """
+    This class represents the static connection of a zone entrance's region to its parent region.
+
+    :param entrance_name: The name of the entrance, which is also the name of its region.
+    :param parent_region_name: The name of the region the entrance is entered from.
+    :param access_rule_name: The name of the macro that determines access to the entrance.
+    :param access_rule: The macro that determines access to the entrance.
+    """
+
+    entrance_name: str
+    parent_region_name: str
+    access_rule_name: str
+    access_rule: Callable[[CollectionState, int], bool]
+
+
+def _get_parent_region_name(zone_entrance: ZoneEntrance) -> str:
+    """
+    Get the name of the region a zone entrance is entered from.
+
+    :param zone_entrance: The zone entrance.
+    :return: The name of the parent region.
+    """
+    if not zone_entrance.is_nested:
+        return "The Great Sea"
+    parent_region_name = zone_entrance.entrance_name.split(" in ")[-1]
+    # Consider Hyrule Castle and Forsaken Fortress as part of The Great Sea (regions are not randomizable).
+    if parent_region_name in ["Hyrule Castle", "Forsaken Fortress"]:
+        parent_region_name = "The Great Sea"
+    return parent_region_name
+
+
+# The connections of every entrance to its parent region, with the access macros resolved once at import time.
+# Island entrances are listed before nested entrances.
+ENTRANCE_CONNECTIONS: dict[str, EntranceConnection] = {
+    entrance.entrance_name: EntranceConnection(
+        entrance.entrance_name,
+        _get_parent_region_name(entrance),
+        get_access_rule_name(entrance.entrance_name),
+        getattr(Macros, get_access_rule_name(entrance.entrance_name)),
+    )
+    for entrance in (
+        DUNGEON_ENTRANCES
+        + SECRET_CAVE_ENTRANCES
+        + FAIRY_FOUNTAIN_ENTRANCES
+        + MINIBOSS_ENTRANCES
+        + BOSS_ENTRANCES
+        + SECRET_CAVE_INNER_ENTRANCES
+    )
+}
+
+
 class EntranceRandomizer:
     """
     This class handles the logic for The Wind Waker entrance randomizer.
@@ -269,10 +455,14 @@ class EntranceRandomizer:
         self.world = world
         self.multiworld = world.multiworld
         self.player = world.player
+        # The random number generator for the current attempt at randomizing the entrances.
+        self.random: Random = self.multiworld.random
 
-        self.item_location_to_containing_zone_exit: dict[str, ZoneExit] = {}
-        self.zone_exit_to_logically_dependent_item_locations: dict[ZoneExit, list[str]] = defaultdict(list)
-        self.register_mappings_between_item_locations_and_zone_exits()
+        # These mappings are shared by all worlds, since they do not depend on the world's options.
+        self.item_location_to_containing_zone_exit: Mapping[str, ZoneExit] = ITEM_LOCATION_TO_CONTAINING_ZONE_EXIT
+        self.zone_exit_to_logically_dependent_item_locations: Mapping[ZoneExit, tuple[str, ...]] = (
+            ZONE_EXIT_TO_LOGICALLY_DEPENDENT_ITEM_LOCATIONS
+        )
 
         # Default entrances connections to be used if the entrance randomizer is not on.
         self.entrance_connections: dict[str, str] = {
@@ -336,23 +526,109 @@ class EntranceRandomizer:
             self.done_entrances_to_exits[zone_entrance] = zone_exit
             self.done_exits_to_entrances[zone_exit] = zone_entrance
 
-        self.banned_exits: list[ZoneExit] = []
+        # The outermost (island) entrance leading to each entrance whose path to the sea has been decided. Assigning an
+        # exit to an entrance never changes an existing path, so the cache only needs to be cleared when an exit is
+        # unassigned.
+        self.outermost_entrance_cache: dict[ZoneEntrance, ZoneEntrance] = {}
+
+        self.banned_exits: set[ZoneExit] = set()
         self.islands_with_a_banned_dungeon: set[str] = set()
 
     def randomize_entrances(self) -> None:
         """
         Randomize entrances for The Wind Waker.
         """
+        self.randomize_entrance_sets()
+        self.finalize_all_randomized_sets_of_entrances()
+
+    def randomize_entrance_sets(self) -> None:
+        """
+        Randomize all entrance sets, reshuffling them if the randomizer backs itself into a corner.
+
+        The first attempt uses the multiworld's random number generator. Each further attempt uses a new generator
+        seeded from it, so retries stay deterministic for a given seed. The number of attempts is set by the
+        `entrance_randomization_attempts` option.
+
+        :raises FillError: If no attempt produces a valid set of entrance connections.
+        """
         self.init_banned_exits()
+        initial_entrance_connections = self.entrance_connections.copy()
+        initial_islands_with_a_banned_dungeon = self.islands_with_a_banned_dungeon.copy()
+
+        attempts = self.world.options.entrance_randomization_attempts.value
+        for attempt in range(1, attempts + 1):
+            try:
+                for relevant_entrances, relevant_exits in self.get_all_entrance_sets_to_be_randomized():
+                    self.randomize_one_set_of_entrances(relevant_entrances, relevant_exits)
+                self.validate_entrance_connections()
+                return
+            except FillError as error:
+                if attempt == attempts:
+                    raise FillError(
+                        f"Failed to randomize entrances for player {self.player} after {attempts} attempt(s): {error}"
+                    ) from error
+                logging.debug(
+                    f"Entrance randomization attempt {attempt} failed for player {self.player}, retrying: {error}"
+                )
+
+            self.restore_entrance_connections(initial_entrance_connections, initial_islands_with_a_banned_dungeon)
+            self.random = Random(self.multiworld.random.getrandbits(64))
+
+    def restore_entrance_connections(
+        self, entrance_connections: dict[str, str], islands_with_a_banned_dungeon: set[str]
+    ) -> None:
+        """
+        Undo a failed attempt at randomizing the entrances by restoring the connections from before it.
 
-        for relevant_entrances, relevant_exits in self.get_all_entrance_sets_to_be_randomized():
-            self.randomize_one_set_of_entrances(relevant_entrances, relevant_exits)
+        :param entrance_connections: The entrance connections, keyed by entrance name.
+        :param islands_with_a_banned_dungeon: The islands known to have a banned dungeon.
+        """
+        self.entrance_connections = entrance_connections.copy()
+        self.done_entrances_to_exits.clear()
+        self.done_exits_to_entrances.clear()
+        for entrance_name, exit_name in self.entrance_connections.items():
+            zone_entrance = ZoneEntrance.all[entrance_name]
+            zone_exit = ZoneExit.all[exit_name]
+            self.done_entrances_to_exits[zone_entrance] = zone_exit
+            self.done_exits_to_entrances[zone_exit] = zone_entrance
+        self.outermost_entrance_cache.clear()
+        self.islands_with_a_banned_dungeon = islands_with_a_banned_dungeon.copy()
 
-        self.finalize_all_randomized_sets_of_entrances()
+    def validate_entrance_connections(self) -> None:
+        """
+        Check that the randomized entrances form a valid graph before they are connected in the multiworld.
+
+        Every entrance must lead to exactly one exit, every exit must be reachable from the sea, and in required bosses
+        mode, no island may hold both a banned boss and a required boss.
+
+        :raises FillError: If the entrance connections are not valid.
+        """
+        num_entrances = len(self.done_entrances_to_exits)
+        if num_entrances != len(ALL_ENTRANCES) or len(self.done_exits_to_entrances) != num_entrances:
+            raise FillError("Not every entrance is connected to an exit.")
+        for zone_entrance, zone_exit in self.done_entrances_to_exits.items():
+            if self.done_exits_to_entrances.get(zone_exit) != zone_entrance:
+                raise FillError(f"Exit is connected to more than one entrance: {zone_exit.unique_name}")
+            # An exit is reachable from the sea if and only if the entrance leading to it is.
+            if self.get_outermost_entrance_for_entrance(zone_entrance) is None:
+                raise FillError(f"Entrance is not reachable from the sea: {zone_entrance.entrance_name}")
+
+        if self.world.options.required_bosses:
+            # Ensure we didn't accidentally place a banned boss and a required boss on the same island.
+            banned_island_names = set(
+                self.get_entrance_zone_for_boss(boss_name) for boss_name in self.world.boss_reqs.banned_bosses
+            )
+            required_island_names = set(
+                self.get_entrance_zone_for_boss(boss_name) for boss_name in self.world.boss_reqs.required_bosses
+            )
+            if banned_island_names & required_island_names:
+                raise FillError(
+                    f"Banned and required bosses share an island: {sorted(banned_island_names & required_island_names)}"
+                )
 
     def init_banned_exits(self) -> None:
         """
-        Initialize the list of banned exits for the randomizer.
+        Initialize the set of banned exits for the randomizer.
 
         Dungeon exits in banned dungeons should be prohibited from being randomized.
         Additionally, if dungeon entrances are not randomized, we can now note which island holds these banned dungeons.
@@ -364,11 +640,11 @@ class EntranceRandomizer:
                 assert zone_exit.unique_name.endswith(" Boss Arena")
                 boss_name = zone_exit.unique_name.removesuffix(" Boss Arena")
                 if boss_name in self.world.boss_reqs.banned_bosses:
-                    self.banned_exits.append(zone_exit)
+                    self.banned_exits.add(zone_exit)
             for zone_exit in DUNGEON_EXITS:
                 dungeon_name = zone_exit.unique_name
                 if dungeon_name in self.world.boss_reqs.banned_dungeons:
-                    self.banned_exits.append(zone_exit)
+                    self.banned_exits.add(zone_exit)
             for zone_exit in MINIBOSS_EXITS:
                 if zone_exit == ZoneExit.all["Master Sword Chamber"]:
                     # Hyrule cannot be chosen as a banned dungeon.
@@ -376,7 +652,7 @@ class EntranceRandomizer:
                 assert zone_exit.unique_name.endswith(" Miniboss Arena")
                 dungeon_name = zone_exit.unique_name.removesuffix(" Miniboss Arena")
                 if dungeon_name in self.world.boss_reqs.banned_dungeons:
-                    self.banned_exits.append(zone_exit)
+                    self.banned_exits.add(zone_exit)
 
         if not options.randomize_dungeon_entrances:
             # If dungeon entrances are not randomized, `islands_with_a_banned_dungeon` can be initialized early since
@@ -398,17 +674,18 @@ class EntranceRandomizer:
         # Keep miniboss and boss entrances vanilla in non-required bosses' dungeons.
         for zone_entrance in relevant_entrances.copy():
             zone_exit = self.done_entrances_to_exits[zone_entrance]
-            if zone_exit in self.banned_exits and zone_exit in MINIBOSS_EXITS + BOSS_EXITS:
+            if zone_exit in self.banned_exits and zone_exit in MINIBOSS_AND_BOSS_EXITS:
                 relevant_entrances.remove(zone_entrance)
             else:
                 del self.done_entrances_to_exits[zone_entrance]
         for zone_exit in relevant_exits.copy():
-            if zone_exit in self.banned_exits and zone_exit in MINIBOSS_EXITS + BOSS_EXITS:
+            if zone_exit in self.banned_exits and zone_exit in MINIBOSS_AND_BOSS_EXITS:
                 relevant_exits.remove(zone_exit)
             else:
                 del self.done_exits_to_entrances[zone_exit]
+        self.outermost_entrance_cache.clear()
 
-        self.multiworld.random.shuffle(relevant_entrances)
+        self.random.shuffle(relevant_entrances)
 
         # We calculate which exits are terminal (the end of a nested chain) per set instead of for all entrances.
         # This is so that, for example, Ice Ring Isle counts as terminal when its inner cave is not being randomized.
@@ -440,7 +717,7 @@ class EntranceRandomizer:
         :param zone_exit: The zone exit to check.
         :return: Whether the zone exit leads to progress locations.
         """
-        locs_for_exit = self.zone_exit_to_logically_dependent_item_locations[zone_exit]
+        locs_for_exit = self.zone_exit_to_logically_dependent_item_locations.get(zone_exit, ())
         assert locs_for_exit, f"Could not find any item locations corresponding to zone exit: {zone_exit.unique_name}"
 
         # Banned required bosses mode dungeons still technically count as progress locations, so filter them out
@@ -527,13 +804,29 @@ class EntranceRandomizer:
         :raises FillError: If there are no valid exits to assign to an entrance.
         """
         options = self.world.options
+        random = self.random
 
         remaining_entrances = relevant_entrances.copy()
-        remaining_exits = relevant_exits.copy()
 
-        doing_banned = False
-        if any(ex in self.banned_exits for ex in relevant_exits):
-            doing_banned = True
+        # The remaining exits and each category of exits are kept as bitmasks, where bit `i` stands for
+        # `relevant_exits[i]`. Iterating over the bits in ascending order visits the exits in their original order, so
+        # the exits are chosen exactly as if they were picked from a list.
+        terminal_exits_mask = 0
+        terminal_non_dungeon_exits_mask = 0
+        banned_dungeon_exits_mask = 0
+        terminal_exit_set = set(terminal_exits)
+        for i, zone_exit in enumerate(relevant_exits):
+            if zone_exit in terminal_exit_set:
+                terminal_exits_mask |= 1 << i
+                if zone_exit not in DUNGEON_AND_BOSS_EXITS:
+                    terminal_non_dungeon_exits_mask |= 1 << i
+            if zone_exit in self.banned_exits and zone_exit in DUNGEON_AND_BOSS_EXITS:
+                # We only keep track of dungeon exits and boss exits, not miniboss exits.
+                # Banned miniboss exits can share an island with required dungeons/bosses.
+                banned_dungeon_exits_mask |= 1 << i
+        remaining_exits_mask = (1 << len(relevant_exits)) - 1
+
+        doing_banned = not self.banned_exits.isdisjoint(relevant_exits)
 
         if options.required_bosses and not doing_banned:
             # Prioritize entrances that share an island with an entrance randomized to lead into a
@@ -553,22 +846,40 @@ class EntranceRandomizer:
                 remaining_entrances.remove(zone_entrance)
             remaining_entrances = entrances_not_on_unique_islands + remaining_entrances
 
-        while remaining_entrances:
-            # Filter out boss entrances that aren't yet accessible from the sea.
+        # Likewise, bit `i` of this mask stands for `remaining_entrances[i]`.
+        remaining_entrances_mask = (1 << len(remaining_entrances)) - 1
+
+        while remaining_entrances_mask:
+            # Pick the first entrance that is accessible from the sea, skipping boss entrances that aren't yet.
             # We don't want to connect these to anything yet or we risk creating an infinite loop.
-            possible_remaining_entrances = [
-                en for en in remaining_entrances if self.get_outermost_entrance_for_entrance(en) is not None
-            ]
-            zone_entrance = possible_remaining_entrances.pop(0)
-            remaining_entrances.remove(zone_entrance)
+            # We also note whether there is another accessible entrance left after this one.
+            zone_entrance = None
+            zone_entrance_bit = 0
+            is_last_possible_entrance = True
+            entrances_mask = remaining_entrances_mask
+            while entrances_mask:
+                bit = entrances_mask & -entrances_mask
+                entrances_mask ^= bit
+                en = remaining_entrances[bit.bit_length() - 1]
+                if self.get_outermost_entrance_for_entrance(en) is None:
+                    continue
+                if zone_entrance is None:
+                    zone_entrance = en
+                    zone_entrance_bit = bit
+                else:
+                    is_last_possible_entrance = False
+                    break
+            if zone_entrance is None:
+                raise FillError("No remaining entrances are accessible from the sea.")
+            remaining_entrances_mask ^= zone_entrance_bit
 
-            possible_remaining_exits = remaining_exits.copy()
+            possible_exits_mask = remaining_exits_mask
 
-            if len(possible_remaining_entrances) == 0 and len(remaining_entrances) > 0:
+            if is_last_possible_entrance and remaining_entrances_mask:
                 # If this is the last entrance we have left to attach exits to, we can't place a terminal exit here.
                 # Terminal exits do not create another entrance, so one would leave us with no possible way to continue
                 # placing the remaining exits on future loops.
-                possible_remaining_exits = [ex for ex in possible_remaining_exits if ex not in terminal_exits]
+                possible_exits_mask &= ~terminal_exits_mask
 
             if options.required_bosses and zone_entrance.island_name is not None and not doing_banned:
                 # Prevent required bosses (and non-terminal exits, which could lead to required bosses) from appearing
@@ -580,36 +891,34 @@ class EntranceRandomizer:
                 # either a miniboss or one of the caves that does not have a nested entrance inside. We allow multiple
                 # banned and required dungeons on a single island.
                 if zone_entrance.island_name in self.islands_with_a_banned_dungeon:
-                    possible_remaining_exits = [
-                        ex
-                        for ex in possible_remaining_exits
-                        if ex in terminal_exits and ex not in (DUNGEON_EXITS + BOSS_EXITS)
-                    ]
+                    possible_exits_mask &= terminal_non_dungeon_exits_mask
 
-            if not possible_remaining_exits:
+            if not possible_exits_mask:
                 raise FillError(f"No valid exits to place for entrance: {zone_entrance.entrance_name}")
 
-            zone_exit = self.multiworld.random.choice(possible_remaining_exits)
-            remaining_exits.remove(zone_exit)
+            # Choose the `n`-th possible exit. This consumes the random number generator the same way as calling
+            # `random.choice` on a list of the possible exits.
+            for _ in range(random.randrange(possible_exits_mask.bit_count())):
+                possible_exits_mask &= possible_exits_mask - 1
+            zone_exit_bit = possible_exits_mask & -possible_exits_mask
+            remaining_exits_mask ^= zone_exit_bit
+            zone_exit = relevant_exits[zone_exit_bit.bit_length() - 1]
 
             self.entrance_connections[zone_entrance.entrance_name] = zone_exit.unique_name
             self.done_entrances_to_exits[zone_entrance] = zone_exit
             self.done_exits_to_entrances[zone_exit] = zone_entrance
 
-            if zone_exit in self.banned_exits:
+            if zone_exit_bit & banned_dungeon_exits_mask:
                 # Keep track of which islands have a required bosses mode banned dungeon to avoid marker overlap.
-                if zone_exit in DUNGEON_EXITS + BOSS_EXITS:
-                    # We only keep track of dungeon exits and boss exits, not miniboss exits.
-                    # Banned miniboss exits can share an island with required dungeons/bosses.
-                    outer_entrance = self.get_outermost_entrance_for_entrance(zone_entrance)
-
-                    # Because we filter above so that we always assign entrances from the sea inwards, we can assume
-                    # that when we assign an entrance, it has a path back to the sea.
-                    # If we're assigning a non-terminal entrance, any nested entrances will get assigned after this one,
-                    # and we'll run through this code again (so we can reason based on `zone_exit` only instead of
-                    # having to recurse through the nested exits to find banned dungeons/bosses).
-                    assert outer_entrance and outer_entrance.island_name is not None
-                    self.islands_with_a_banned_dungeon.add(outer_entrance.island_name)
+                outer_entrance = self.get_outermost_entrance_for_entrance(zone_entrance)
+
+                # Because we filter above so that we always assign entrances from the sea inwards, we can assume
+                # that when we assign an entrance, it has a path back to the sea.
+                # If we're assigning a non-terminal entrance, any nested entrances will get assigned after this one,
+                # and we'll run through this code again (so we can reason based on `zone_exit` only instead of
+                # having to recurse through the nested exits to find banned dungeons/bosses).
+                assert outer_entrance and outer_entrance.island_name is not None
+                self.islands_with_a_banned_dungeon.add(outer_entrance.island_name)
 
     def finalize_all_randomized_sets_of_entrances(self) -> None:
         """
@@ -617,49 +926,18 @@ class EntranceRandomizer:
 
         For all entrance-exit pairs, this function adds a connection with the appropriate access rule to the world.
         """
-
-        def get_access_rule(region: str) -> str:
-            snake_case_region = region.lower().replace("'", "").replace(" ", "_")
-            return f"can_access_{snake_case_region}"
+        player = self.player
 
         # Connect each entrance-exit pair in the multiworld with the access rule for the entrance.
         for zone_entrance, zone_exit in self.done_entrances_to_exits.items():
             entrance_region = self.world.get_region(zone_entrance.entrance_name)
             exit_region = self.world.get_region(zone_exit.unique_name)
-            entrance_region.connect(
-                exit_region,
-                rule=lambda state, entrance=entrance_region.name: getattr(Macros, get_access_rule(entrance))(
-                    state, self.player
-                ),
-            )
-
-        if self.world.options.required_bosses:
-            # Ensure we didn't accidentally place a banned boss and a required boss on the same island.
-            banned_island_names = set(
-                self.get_entrance_zone_for_boss(boss_name) for boss_name in self.world.boss_reqs.banned_bosses
-            )
-            required_island_names = set(
-                self.get_entrance_zone_for_boss(boss_name) for boss_name in self.world.boss_reqs.required_bosses
-            )
-            assert not banned_island_names & required_island_names
-
-    def register_mappings_between_item_locations_and_zone_exits(self) -> None:
-        """
-        Map item locations to their corresponding zone exits.
-        """
-        for loc_name in list(LOCATION_TABLE.keys()):
-            zone_exit = self.get_zone_exit_for_item_location(loc_name)
-            if zone_exit is not None:
-                self.item_location_to_containing_zone_exit[loc_name] = zone_exit
-                self.zone_exit_to_logically_dependent_item_locations[zone_exit].append(loc_name)
-
-            if loc_name == "The Great Sea - Withered Trees":
-                # This location isn't inside a zone exit, but it does logically require the player to be able to reach
-                # a different item location inside one.
-                for sub_loc_name in ["Cliff Plateau Isles - Highest Isle"]:
-                    sub_zone_exit = self.get_zone_exit_for_item_location(sub_loc_name)
-                    if sub_zone_exit is not None:
-                        self.zone_exit_to_logically_dependent_item_locations[sub_zone_exit].append(loc_name)
+            connection = ENTRANCE_CONNECTIONS[zone_entrance.entrance_name]
+            # Prefer the compiled version of the access rule, falling back to the macro itself.
+            rule = self.world.logic_compiler.macro_rule(connection.access_rule_name)
+            if rule is None:
+                rule = lambda state, access_rule=connection.access_rule: access_rule(state, player)
+            entrance_region.connect(exit_region, rule=rule)
 
     def get_all_entrance_sets_to_be_randomized(
         self,
@@ -762,14 +1040,28 @@ class EntranceRandomizer:
         """
         Unrecurses nested dungeons to determine a given entrance's outermost (island) entrance.
 
+        The result is cached for every entrance on the path, so later calls for any of them only need a lookup.
+
         :param zone_exit: The given entrance.
+        :raises FillError: If the entrances are in an infinite loop.
         :return: The outermost (island) entrance for the entrance, or `None` if entrances have yet to be randomized.
         """
-        seen_entrances = self.get_all_entrances_on_path_to_entrance(zone_entrance)
-        if seen_entrances is None:
-            # Undecided.
-            return None
-        outermost_entrance = seen_entrances[-1]
+        cache = self.outermost_entrance_cache
+        seen_entrances: list[ZoneEntrance] = []
+        while zone_entrance not in cache and zone_entrance.is_nested:
+            if zone_entrance in seen_entrances:
+                path_str = ", ".join([e.entrance_name for e in seen_entrances])
+                raise FillError(f"Entrances are in an infinite loop: {path_str}")
+            seen_entrances.append(zone_entrance)
+            if zone_entrance.nested_in not in self.done_exits_to_entrances:
+                # Undecided.
+                return None
+            zone_entrance = self.done_exits_to_entrances[zone_entrance.nested_in]
+
+        outermost_entrance = cache.get(zone_entrance, zone_entrance)
+        cache[zone_entrance] = outermost_entrance
+        for seen_entrance in seen_entrances:
+            cache[seen_entrance] = outermost_entrance
         return outermost_entrance
 
     def get_all_entrances_on_path_to_entrance(self, zone_entrance: ZoneEntrance) -> Optional[list[ZoneEntrance]]:
@@ -799,58 +1091,16 @@ class EntranceRandomizer:
         :param location_name: The location to check.
         :return: `True` if the location is behind a randomizable entrance, `False` otherwise.
         """
-        loc_zone_name, _ = split_location_name_by_zone(location_name)
-        if loc_zone_name in ["Ganon's Tower", "Mailbox"]:
-            # Ganon's Tower and the handful of Mailbox locations that depend on beating dungeon bosses are considered
-            # "Dungeon" location types by the logic, but the entrance randomizer does not need to consider them.
-            # Although the mail locations are technically locked behind dungeons, we can still ignore them here because
-            # if all of the locations in the dungeon itself are nonprogress, then any mail depending on that dungeon
-            # should also be enforced as nonprogress by other parts of the code.
-            return False
-
-        types = LOCATION_TABLE[location_name].flags
-        is_boss = TWWFlag.BOSS in types
-        if loc_zone_name == "Forsaken Fortress" and not is_boss:
-            # Special case. FF is a dungeon that is not randomized, except for the boss arena.
-            return False
-
-        is_big_octo = TWWFlag.BG_OCTO in types
-        if is_big_octo:
-            # The Big Octo Great Fairy is the only Great Fairy location that is not also a Fairy Fountain.
-            return False
-
-        # In the general case, we check if the location has a type corresponding to exits that can be randomized.
-        if any(t in types for t in ENTRANCE_RANDOMIZABLE_ITEM_LOCATION_TYPES):
-            return True
-
-        return False
+        return is_item_location_behind_randomizable_entrance(location_name)
 
     def get_zone_exit_for_item_location(self, location_name: str) -> Optional[ZoneExit]:
         """
         Retrieve the zone exit for a given location.
 
         :param location_name: The name of the location.
-        :raises Exception: If a location exit override should be used instead.
         :return: The zone exit for the location or `None` if the location is not behind a randomizable entrance.
         """
-        if not self.is_item_location_behind_randomizable_entrance(location_name):
-            return None
-
-        zone_exit = ITEM_LOCATION_NAME_TO_EXIT_OVERRIDES.get(location_name, None)
-        if zone_exit is not None:
-            return zone_exit
-
-        loc_zone_name, _ = split_location_name_by_zone(location_name)
-        possible_exits = [ex for ex in ZoneExit.all.values() if ex.zone_name == loc_zone_name]
-        if len(possible_exits) == 0:
-            return None
-        elif len(possible_exits) == 1:
-            return possible_exits[0]
-        else:
-            raise Exception(
-                f"Multiple zone exits share the same zone name: {loc_zone_name!r}. "
-                "Use a location exit override instead."
-            )
+        return ITEM_LOCATION_TO_CONTAINING_ZONE_EXIT.get(location_name)
 
     def get_entrance_zone_for_boss(self, boss_name: str) -> str:
         """
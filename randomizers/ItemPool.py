@@ -100,9 +100,7 @@ def get_pool_core(world: "TWWWorld") -> tuple[list[str], list[str]]:
     filler_pool: list[str] = []
     for item, data in ITEM_TABLE.items():
         if data.type == "Item":
-            adjusted_classification = world.determine_item_classification(item)
-            classification = data.classification if adjusted_classification is None else adjusted_classification
-
+            classification = world.item_classifications[item]
             if classification & IC.progression:
                 progression_pool.extend([item] * data.quantity)
             elif classification & IC.useful:
@@ -2,12 +2,27 @@ from typing import TYPE_CHECKING
 
 from Options import OptionError
 
-from ..Locations import DUNGEON_NAMES, LOCATION_TABLE, TWWFlag, split_location_name_by_zone
+from ..Locations import (
+    DUNGEON_NAMES,
+    LOCATION_COLUMNS,
+    LOCATION_NAMES_BY_FLAG,
+    LOCATION_NAMES_BY_ZONE,
+    TWWFlag,
+    split_location_name_by_zone,
+)
 from ..Options import TWWOptions
 
 if TYPE_CHECKING:
     from .. import TWWWorld
 
+# The mail locations that depend on beating a dungeon's boss, and the name of that dungeon.
+MAIL_LOCATION_DUNGEONS: dict[str, str] = {
+    "Mailbox - Letter from Orca": "Forbidden Woods",
+    "Mailbox - Letter from Baito": "Earth Temple",
+    "Mailbox - Letter from Aryll": "Forsaken Fortress",
+    "Mailbox - Letter from Tingle": "Forsaken Fortress",
+}
+
 
 class RequiredBossesRandomizer:
     """
@@ -87,17 +102,12 @@ class RequiredBossesRandomizer:
 
         # Exclude locations that are not in the dungeon of a required boss.
         banned_dungeons = dungeon_names - required_dungeons
-        for location_name, location_data in LOCATION_TABLE.items():
-            dungeon_name, _ = split_location_name_by_zone(location_name)
-            if dungeon_name in banned_dungeons and TWWFlag.DUNGEON in location_data.flags:
-                self.banned_locations.add(location_name)
-            elif location_name == "Mailbox - Letter from Orca" and "Forbidden Woods" in banned_dungeons:
-                self.banned_locations.add(location_name)
-            elif location_name == "Mailbox - Letter from Baito" and "Earth Temple" in banned_dungeons:
-                self.banned_locations.add(location_name)
-            elif location_name == "Mailbox - Letter from Aryll" and "Forsaken Fortress" in banned_dungeons:
-                self.banned_locations.add(location_name)
-            elif location_name == "Mailbox - Letter from Tingle" and "Forsaken Fortress" in banned_dungeons:
+        for dungeon_name in banned_dungeons:
+            for location_name in LOCATION_NAMES_BY_ZONE.get(dungeon_name, ()):
+                if LOCATION_COLUMNS.flags_of(location_name) & TWWFlag.DUNGEON.value:
+                    self.banned_locations.add(location_name)
+        for location_name, dungeon_name in MAIL_LOCATION_DUNGEONS.items():
+            if dungeon_name in banned_dungeons:
                 self.banned_locations.add(location_name)
         for location_name in self.banned_locations:
             self.world.nonprogress_locations.add(location_name)
@@ -106,7 +116,7 @@ class RequiredBossesRandomizer:
         self.required_boss_item_locations = []
         self.required_bosses = []
         self.banned_bosses = []
-        possible_boss_item_locations = [loc for loc, data in LOCATION_TABLE.items() if TWWFlag.BOSS in data.flags]
+        possible_boss_item_locations = LOCATION_NAMES_BY_FLAG[TWWFlag.BOSS]
         for location_name in possible_boss_item_locations:
             dungeon_name, specific_location_name = split_location_name_by_zone(location_name)
             assert specific_location_name.endswith(" Heart Container")